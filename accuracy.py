@@ -0,0 +1,58 @@
+import os
+from types import MappingProxyType
+
+import pandas as pd
+import streamlit as st
+
+from crops import CROPS
+from data_store import file_key
+
+# Model accuracy per crop, from accuracy.xlsx.
+#
+# The sheet is read once per file version and held with st.cache_resource as
+# {crop key: {metric column: fraction}}, so filling a page's metrics table is
+# a dict lookup. Missing values ("-" in the sheet) are NaN.
+
+ACCURACY_FILE = 'accuracy.xlsx'
+
+METRICS = ['NextMonth', '3monthaccuracy', '6monthaccuracy', 'DirectionalAccuracy']
+
+# Crop names of the accuracy sheet that are not simply the crop key
+ALIASES = {
+    'Paddy Fine': 'finepaddy',
+    'Bengal Gram': 'chana',
+    'Soyabean': 'soya',
+    'Aqua': 'shrimp',
+}
+
+
+def crop_key(name):
+    """Dashboard crop key for a crop name of the accuracy sheet, or None."""
+    name = str(name).strip()
+    key = ALIASES.get(name, name.lower().replace(' ', ''))
+    return key if key in CROPS else None
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_accuracy(key):
+    df = pd.read_excel(key[0])
+    # Headers carry trailing spaces ('3monthaccuracy ')
+    df.columns = df.columns.str.strip()
+    df['Crop'] = df['Crop'].map(crop_key)
+    df = df.dropna(subset=['Crop']).set_index('Crop')
+    metrics = df.reindex(columns=METRICS).apply(pd.to_numeric, errors='coerce')
+    return MappingProxyType({
+        crop: MappingProxyType(row) for crop, row in metrics.to_dict('index').items()
+    })
+
+
+def load_accuracy(path=ACCURACY_FILE):
+    """Return a read-only {crop key: {metric: fraction}} mapping."""
+    return _load_accuracy(file_key(path))
+
+
+def crop_accuracy(key, path=ACCURACY_FILE):
+    """Accuracy metrics of one crop; empty if the sheet has no row for it."""
+    if not os.path.exists(path):
+        return {}
+    return load_accuracy(path).get(key, {})
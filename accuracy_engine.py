@@ -0,0 +1,124 @@
+import re
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from crops import CROPS
+from data_store import current_dataset
+from snapshot import MONTHS, fy_start
+
+# Forecast accuracy computed from the workbook itself.
+#
+# Every forecast row ("Predicted May", "Predicted Mid July", ...) is aligned
+# with the "Actual" row of the same dimensions on (financial year, month) in
+# one vectorised merge per sheet. The forecast horizon is counted from the
+# run month of the model: a run made in May forecasts May at horizon 1, June
+# at horizon 2 and so on (months it repeats from the actuals are not
+# forecasts and are dropped). Accuracy of a forecast is 1 - |F - A| / A.
+#
+# Each sheet is a partition cached under its sheet version (a hash of its
+# cells), so when new actuals arrive for one crop only that crop is recomputed; the per-crop
+# metrics are then a cheap groupby over all partitions, cached per dataset
+# version.
+
+# (name, first horizon, last horizon) of the accuracy metrics
+HORIZONS = [
+    ('next_month', 1, 1),
+    ('month_3', 3, 3),
+    ('month_6', 6, 6),
+    ('seasonal', 1, 12),
+    ('avg_3', 1, 3),
+    ('avg_6', 1, 6),
+]
+
+RUN_MONTH = re.compile(r'\b(' + '|'.join(MONTHS) + r')', re.IGNORECASE)
+
+
+def run_month(model):
+    """Fiscal month index (Apr = 0) of the month a model run was made in, or None."""
+    match = RUN_MONTH.search(str(model))
+    return MONTHS.index(match.group(1).title()) if match else None
+
+
+def forecast_errors(df):
+    """One row per forecast with an actual to compare to: Model, Horizon, Accuracy, Direction."""
+    dims = [c for c in df.columns if c not in ('Graph Type', 'Financial Year', 'Model', 'Month', 'Value')]
+    price = df[(df['Graph Type'] == 'Price') & df['Value'].notna()]
+
+    fy = price['Financial Year'].cat.categories.map(fy_start).to_numpy(dtype=float)
+    # Code -1 (no Financial Year) picks the NaN appended at the end, so the
+    # row has no Period and is dropped below
+    fy = np.append(fy, np.nan)
+    rows = pd.DataFrame({
+        **{dim: price[dim].cat.codes.to_numpy() for dim in dims},
+        'Model': price['Model'].astype(str).to_numpy(),
+        'Start': fy[price['Financial Year'].cat.codes.to_numpy()],
+        'Month': price['Month'].cat.codes.to_numpy(),
+        'Value': price['Value'].to_numpy(dtype='float64'),
+    })
+    rows['Period'] = rows['Start'] * 12 + rows['Month']
+    rows = rows.dropna(subset=['Period'])
+
+    is_actual = rows['Model'] == 'Actual'
+    actual = rows[is_actual].groupby([*dims, 'Period'], as_index=False)['Value'].mean()
+    forecast = rows[~is_actual]
+
+    # A run keeps its label across financial years (a July run can reach into
+    # next year's row), so its run period is anchored on the first year it
+    # appears in; Jan-Mar runs forecast the year that starts in April after them
+    models = pd.Series(forecast['Model'].unique())
+    month = models.map(run_month)
+    first_year = forecast.groupby('Model')['Start'].min().reindex(models).to_numpy()
+    run_period = first_year * 12 + month.to_numpy(dtype=float) - np.where(month >= 9, 12, 0)
+    forecast = forecast.assign(Run=forecast['Model'].map(dict(zip(models, run_period))))
+    forecast = forecast.assign(Horizon=forecast['Period'] - forecast['Run'] + 1)
+    forecast = forecast[forecast['Horizon'] >= 1]
+
+    aligned = forecast.merge(actual, on=[*dims, 'Period'], suffixes=('', '_actual'))
+    aligned = aligned[aligned['Value_actual'] > 0]
+    # Last actual known before the forecast month, for the direction of change
+    previous = actual.assign(Period=actual['Period'] + 1).rename(columns={'Value': 'Value_previous'})
+    aligned = aligned.merge(previous, on=[*dims, 'Period'], how='left')
+
+    forecast_move = np.sign(aligned['Value'] - aligned['Value_previous'])
+    actual_move = np.sign(aligned['Value_actual'] - aligned['Value_previous'])
+    return pd.DataFrame({
+        'Model': aligned['Model'].to_numpy(),
+        'Horizon': aligned['Horizon'].astype('int64').to_numpy(),
+        'Accuracy': (1 - (aligned['Value'] - aligned['Value_actual']).abs() / aligned['Value_actual']).clip(lower=0).to_numpy(),
+        'Direction': (forecast_move == actual_move).where(aligned['Value_previous'].notna()).to_numpy(),
+    })
+
+
+@st.cache_resource(max_entries=2 * len(CROPS), show_spinner=False)
+def _sheet_errors(sheet, version, _df):
+    # Keyed by sheet version, not dataset version: unchanged sheets are reused
+    return forecast_errors(_df)
+
+
+def summarize(errors):
+    """Accuracy metrics (fractions, NaN where there is nothing to score) of a set of forecasts."""
+    metrics = {}
+    for name, first, last in HORIZONS:
+        scored = errors.loc[errors['Horizon'].between(first, last), 'Accuracy']
+        metrics[name] = float(scored.mean()) if len(scored) else float('nan')
+    direction = errors.loc[errors['Horizon'] == 1, 'Direction'].dropna()
+    metrics['directional'] = float(direction.astype(float).mean()) if len(direction) else float('nan')
+    return metrics
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _computed_accuracy(version, _dataset):
+    crops = {}
+    for crop in CROPS.values():
+        errors = _sheet_errors(crop.sheet, _dataset.sheet_version(crop.sheet), _dataset.sheet(crop.sheet))
+        crops[crop.key] = MappingProxyType(summarize(errors))
+    return MappingProxyType(crops)
+
+
+def computed_accuracy(crop_key, dataset=None):
+    """Accuracy metrics of a crop computed from its Actual and forecast rows."""
+    dataset = dataset or current_dataset()
+    return _computed_accuracy(dataset.version, dataset)[crop_key]
@@ -1,11 +1,12 @@
 
 import streamlit as st
 
+from crops import LATEST_MODEL_RUN
+from profiling import span
+from thumbnails import read_manifest, thumbnail_path
+from tiles import crop_tiles
 
-st.set_page_config(
-
-    layout="wide",
-)
+# Homepage grid, run by the navigation in homepage.py (which sets the page config)
 
 st.header("ASTRA Price Prognosis Dashboard")
 
@@ -23,9 +24,29 @@ col_crop_pair = {col1:'wheat',
                  col8:'maize',
                  col9:'chili'}
 
+with span('tiles'):
+    tiles = crop_tiles(LATEST_MODEL_RUN)
+manifest = None
+
 for key, val in col_crop_pair.items():
     
     with key.container(border=1):
         st.subheader(val.upper())
-        st.image(f'images/{val}.png')
+        tile = tiles.get(val)
+        if tile is None:
+            # No actual prices yet, fall back to the rendered thumbnail
+            manifest = read_manifest() if manifest is None else manifest
+            st.image(thumbnail_path(val, manifest))
+            continue
+
+        st.metric(
+            f"Latest actual price ({tile.period})",
+            f"{tile.latest:,.0f}",
+            delta=None if tile.mom_change is None else f"{tile.mom_change:+.1%} MoM",
+            chart_data=tile.sparkline,
+            chart_type="line",
+            border=False,
+        )
+        if tile.forecast_gap is not None:
+            st.caption(f"{LATEST_MODEL_RUN} forecast for {tile.forecast_period}: {tile.forecast_gap:+.1%} vs latest actual")
 
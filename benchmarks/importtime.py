@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Import-time profile of the dashboard modules.
+#
+# Imports each module in a fresh interpreter under `python -X importtime`
+# and reports the fastest cumulative import time plus the heaviest imports
+# it pulls in. The numbers are tracked in benchmarks/importtime.json:
+# `--save` records a new baseline, `--check` fails on a regression or when
+# a page module drags in one of the export-only dependencies.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'importtime.json')
+
+# What a page load imports, leaf modules first
+MODULES = ['crops', 'figures', 'data_store', 'slice_cache', 'tiles', 'crop_page']
+
+# Only image exports may load these
+EXPORT_ONLY = ['kaleido', 'choreographer']
+
+# Allowed slowdown against the baseline before --check fails
+TOLERANCE = 1.5
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def profile(module=None):
+    """{imported module: (self us, cumulative us)} for one fresh import of a module."""
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}' if module else 'pass'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stderr
+    times = {}
+    for match in LINE.finditer(out):
+        self_us, cumulative_us, _, name = match.groups()
+        times[name] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(module, repeat, startup):
+    runs = [profile(module) for _ in range(repeat)]
+    last = runs[-1]
+    heaviest = sorted(
+        (name for name in last if name != module and '.' not in name and name not in startup),
+        key=lambda name: last[name][1], reverse=True,
+    )[:5]
+    return {
+        'ms': round(min(run[module][1] for run in runs) / 1000, 1),
+        'heaviest': {name: round(last[name][1] / 1000, 1) for name in heaviest},
+        'export_only': sorted(name for name in last if name.split('.')[0] in EXPORT_ONLY and '.' not in name),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of the dashboard modules.")
+    parser.add_argument('modules', nargs='*', default=MODULES, help="modules to import (default: the page modules)")
+    parser.add_argument('--repeat', type=int, default=5, help="fresh imports per module (default: 5)")
+    parser.add_argument('--save', action='store_true', help=f"record the results as the new baseline in {BASELINE}")
+    parser.add_argument('--check', action='store_true', help="exit non-zero on a regression against the baseline")
+    args = parser.parse_args()
+
+    try:
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    # Imported by the interpreter itself (site, encodings, ...), not by us
+    startup = set(profile())
+
+    results = {}
+    failures = []
+    for module in args.modules:
+        result = results[module] = measure(module, args.repeat, startup)
+        before = baseline.get(module, {}).get('ms')
+        change = f" ({result['ms'] / before - 1:+.0%} vs baseline)" if before else ''
+        print(f"{module:<12} {result['ms']:8.1f} ms{change}")
+        print(f"{'':<12} heaviest: {', '.join(f'{name} {ms} ms' for name, ms in result['heaviest'].items())}")
+        if result['export_only']:
+            failures.append(f"{module} imports {', '.join(result['export_only'])}")
+        if before and result['ms'] > before * TOLERANCE:
+            failures.append(f"{module} took {result['ms']} ms, baseline {before} ms")
+
+    if args.save:
+        with open(BASELINE, 'w') as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+from websockets.sync.client import connect  # noqa: E402
+
+from crops import CROPS  # noqa: E402
+
+# Concurrent-session load test of the dashboard, entirely on localhost.
+#
+# Starts the production launcher (serve.py) on free ports, waits for its
+# /ready endpoint and then drives N sessions at once, each over its own
+# websocket speaking the same protocol as the browser. A session opens the
+# homepage and then, step after step, either navigates to a random crop page
+# or changes one sidebar multiselect to a random set of its options, timing
+# every rerun from the request to the script_finished message. For every
+# session count the report gives rerun latency percentiles, throughput
+# (reruns per second of wall time) and the server's resident memory, in
+# total and per session.
+#
+# AppTest is not used: it swaps a process-wide Runtime on every run, so
+# sessions on several threads break each other, and it skips the
+# serialisation and transport a real server pays for.
+#
+#   python benchmarks/loadtest.py --sessions 1 2 4 8 --steps 20
+
+SERVE = os.path.join(ROOT, 'serve.py')
+
+# Share of steps that navigate to another crop page instead of changing a filter
+SWITCH_RATE = 0.2
+
+# Most options picked when a multiselect changes
+MAX_PICKS = 3
+
+READY_TIMEOUT = 300
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_mib(pid):
+    """Current resident memory of a process."""
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def start_server(log):
+    """Start serve.py on free ports and wait until it reports ready; returns (process, app port)."""
+    port, status_port = free_port(), free_port()
+    server = subprocess.Popen(
+        [sys.executable, SERVE, '--port', str(port), '--status-port', str(status_port), '--watch-interval', '0'],
+        cwd=ROOT, stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"serve.py exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{status_port}/ready', timeout=1):
+                return server, port
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"serve.py was not ready after {READY_TIMEOUT}s")
+
+
+class Session:
+    """One browser tab on an open websocket: the pages it knows and the widget values it shows."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.pages = {}         # url path: page script hash
+        self.page = ''
+        self.widgets = {}       # label: [widget id, options, selected values]
+        self.errors = []
+
+    def rerun(self, page=None, changed=None):
+        """Rerun the script on a page (default: the current one); returns the seconds it took."""
+        if page is not None and page != self.page:
+            # A page starts with the default values of its own widgets
+            self.page, self.widgets = page, {}
+        if changed:
+            label, values = changed
+            self.widgets[label][2] = values
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.pages.get(self.page, '')
+        for widget_id, _, values in self.widgets.values():
+            state = WidgetState(id=widget_id)
+            state.string_array_value.data.extend(values)
+            msg.rerun_script.widget_states.widgets.append(state)
+
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv())
+            kind = fwd.WhichOneof('type')
+            if kind == 'script_finished':
+                return time.perf_counter() - start
+            if kind == 'navigation':
+                self.pages = {p.url_pathname: p.page_script_hash for p in fwd.navigation.app_pages}
+            elif kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                element = fwd.delta.new_element
+                if element.WhichOneof('type') == 'multiselect':
+                    widget = element.multiselect
+                    known = self.widgets.get(widget.label)
+                    if known is None or known[0] != widget.id:
+                        # Like the browser, keep what the user picked; new widgets show their defaults
+                        values = list(widget.raw_values) or [widget.options[i] for i in widget.default]
+                        self.widgets[widget.label] = [widget.id, list(widget.options), values]
+                elif element.WhichOneof('type') == 'exception':
+                    self.errors.append(element.exception.message)
+
+
+def _steps(s, rng, steps, think, latencies):
+    latencies.append(s.rerun())
+    for step in range(steps):
+        if step == 0 or rng.random() < SWITCH_RATE or not s.widgets:
+            latencies.append(s.rerun(page=f"dashboard_{rng.choice(list(CROPS))}"))
+        else:
+            label = rng.choice(list(s.widgets))
+            options = s.widgets[label][1]
+            picks = rng.sample(options, rng.randint(1, min(MAX_PICKS, len(options))))
+            latencies.append(s.rerun(changed=(label, picks)))
+        if think:
+            time.sleep(rng.uniform(0, 2 * think))
+
+
+def session(port, seed, steps, think, latencies, errors, finished, release):
+    try:
+        ws = connect(f'ws://127.0.0.1:{port}/_stcore/stream', subprotocols=['streamlit'], max_size=None)
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+        finished.release()
+        return
+    with ws:
+        s = Session(ws)
+        try:
+            _steps(s, random.Random(seed), steps, think, latencies)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            errors.extend(s.errors)
+            # Stay connected until the server's memory has been measured
+            finished.release()
+            release.wait()
+
+
+def run_level(server, port, sessions, steps, think, seed):
+    latencies, errors = [], []
+    finished, release = threading.Semaphore(0), threading.Event()
+    threads = [
+        threading.Thread(target=session, args=(port, seed + i, steps, think, latencies, errors, finished, release))
+        for i in range(sessions)
+    ]
+    rss_before = rss_mib(server.pid)
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for _ in threads:
+        finished.acquire()
+    wall = time.perf_counter() - start
+    # Measured while every session is still connected
+    rss_after = rss_mib(server.pid)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    ms = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'p50_ms': round(float(np.percentile(ms, 50)), 1),
+        'p90_ms': round(float(np.percentile(ms, 90)), 1),
+        'p99_ms': round(float(np.percentile(ms, 99)), 1),
+        'max_ms': round(float(ms.max()), 1),
+        'reruns_per_s': round(len(latencies) / wall, 2),
+        'rss_mib': round(rss_after, 1),
+        'rss_per_session_mib': round((rss_after - rss_before) / sessions, 2),
+        'errors': sorted(set(errors)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of the dashboard.")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8], help="session counts to run (default: 1 2 4 8)")
+    parser.add_argument('--steps', type=int, default=20, help="page switches and filter changes per session (default: 20)")
+    parser.add_argument('--think', type=float, default=0.0, help="mean pause between steps in seconds (default: 0)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryFile(mode='w+') as log:
+        server, port = start_server(log)
+        try:
+            print(f"serve.py ready on port {port}, {rss_mib(server.pid):.1f} MiB resident")
+            print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+                  f"{'reruns/s':>9} {'RSS MiB':>8} {'MiB/sess':>9}")
+            for sessions in args.sessions:
+                result = run_level(server, port, sessions, args.steps, args.think, args.seed)
+                results.append(result)
+                print(f"{sessions:>8} {result['reruns']:>7} {result['p50_ms']:>8} {result['p90_ms']:>8} "
+                      f"{result['p99_ms']:>8} {result['max_ms']:>8} {result['reruns_per_s']:>9} "
+                      f"{result['rss_mib']:>8} {result['rss_per_session_mib']:>9}")
+                for error in result['errors']:
+                    print(f"{'':>8} error: {error}")
+        finally:
+            server.terminate()
+            server.wait()
+        if any(result['errors'] for result in results):
+            log.seek(0)
+            print(log.read()[-4000:])
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    if any(result['errors'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
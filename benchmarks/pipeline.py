@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from crop_page import crop_graph, default_selection  # noqa: E402
+from crops import CROPS, LATEST_MODEL_RUN  # noqa: E402
+from data_store import freeze  # noqa: E402
+from dimension_index import DimensionIndex  # noqa: E402
+from slice_cache import _build_slice  # noqa: E402
+from snapshot import WORKBOOK, build_snapshot, melt_sheet, read_sheet  # noqa: E402
+
+# Time and peak memory of every stage a crop page goes through.
+#
+# Runs headless against each crop sheet of a workbook, calling the stages
+# directly with every Streamlit cache out of the way:
+#   parse        read the sheet from the xlsx and melt it (a cold load)
+#   load         read and freeze its Parquet snapshot (a warm load)
+#   index        build the DimensionIndex
+#   filter_isin  the former per-page mask of one isin() per sidebar filter
+#   filter       DimensionIndex.select of the default view
+#   filter_sql   the same selection on the SQLite backend (fact_store.py)
+#   slice        selection plus the per-series groups the figure is built from
+#   figure       build the Plotly figure
+#   serialize    Figure.to_json, what st.plotly_chart sends to the browser
+#   export       PNG export through Kaleido (skipped without a Chrome)
+# Times are the best of --repeat samples, peak memory comes from one extra
+# run under tracemalloc. Results are tracked per workbook in
+# benchmarks/pipeline.json: `--save` records a new baseline, `--check` fails
+# on a regression.
+
+BASELINE = os.path.join(ROOT, 'benchmarks', 'pipeline.json')
+
+STAGES = ['parse', 'load', 'index', 'filter_isin', 'filter', 'filter_sql', 'slice', 'figure', 'serialize', 'export']
+
+# Allowed growth against the baseline before --check fails. Times swing a
+# lot between runs on a shared box, peak memory hardly at all; the absolute
+# slack keeps tiny stages from flapping. Record the baseline on the machine
+# that runs --check.
+TOLERANCE = 2.0
+SLACK_MS = 1.0
+MEMORY_TOLERANCE = 1.25
+SLACK_KIB = 64
+
+# A sample repeats a fast stage until it takes at least this long
+MIN_SAMPLE_SECONDS = 0.01
+
+
+def isin_filter(df, selection):
+    mask = np.ones(len(df), dtype=bool)
+    for dim, values in selection.items():
+        mask &= df[dim].isin(values).to_numpy()
+    return df[mask]
+
+
+def export_png(fig):
+    from plotly.io import to_image
+
+    return to_image(fig, format='png')
+
+
+def crop_stages(crop, path, snapshot_dir, versions, tables, latest_model_run):
+    """[(stage, callable)] of a crop; every callable returns what the next stage needs."""
+    selection = default_selection(crop, latest_model_run)
+    version = versions[crop.sheet]
+    df = freeze(read_sheet(crop.sheet, version, snapshot_dir))
+    index = DimensionIndex(df, dims=[c for c in df.columns if c not in ('Month', 'Value')])
+    groups = _build_slice(index, selection).groups
+    fig = crop_graph(crop, selection['Graph Type'], groups)
+    return [
+        ('parse', lambda: melt_sheet(pd.read_excel(path, sheet_name=crop.sheet))),
+        ('load', lambda: freeze(read_sheet(crop.sheet, version, snapshot_dir))),
+        ('index', lambda: DimensionIndex(df, dims=index.dims)),
+        ('filter_isin', lambda: isin_filter(df, selection)),
+        ('filter', lambda: index.select(selection)),
+        ('filter_sql', lambda: tables[crop.sheet].select(selection)),
+        ('slice', lambda: _build_slice(index, selection)),
+        ('figure', lambda: crop_graph(crop, selection['Graph Type'], groups)),
+        ('serialize', lambda: fig.to_json()),
+        ('export', lambda: export_png(fig)),
+    ]
+
+
+def measure(stage, repeat):
+    """{'ms': best time of one call, 'peak_kib': peak traced allocation of one call}."""
+    start = time.perf_counter()
+    stage()
+    first = time.perf_counter() - start
+    number = max(1, int(MIN_SAMPLE_SECONDS / first)) if first else 1000
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            stage()
+        samples.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        stage()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return {'ms': round(min(samples) * 1000, 3), 'peak_kib': round(peak / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and peak memory of the crop page stages.")
+    parser.add_argument('--workbook', default=os.path.join(ROOT, WORKBOOK), help="workbook to run against (default: price_data.xlsx)")
+    parser.add_argument('--crops', nargs='*', default=list(CROPS), help="crop keys (default: all)")
+    parser.add_argument('--stages', nargs='*', default=STAGES, choices=STAGES, help="stages to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed samples per stage (default: 5)")
+    parser.add_argument('--save', action='store_true', help=f"record the results as the new baseline in {BASELINE}")
+    parser.add_argument('--check', action='store_true', help="exit non-zero on a regression against the baseline")
+    args = parser.parse_args()
+
+    try:
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+    workbook = os.path.basename(args.workbook)
+    before_workbook = baseline.get(workbook, {})
+
+    from fact_store import open_tables
+
+    results = {}
+    failures = []
+    with tempfile.TemporaryDirectory(prefix='pipeline-') as snapshot_dir:
+        # Snapshots and the fact database of the workbook under test, never the app's own
+        versions = build_snapshot(args.workbook, snapshot_dir)
+        tables = open_tables(versions, os.path.join(snapshot_dir, '.facts.sqlite'), snapshot_dir)
+
+        for key in args.crops:
+            crop = CROPS[key]
+            stages = dict(crop_stages(crop, args.workbook, snapshot_dir, versions, tables, LATEST_MODEL_RUN))
+            results[key] = {}
+            print(f"{key} ({crop.sheet}, {len(tables[crop.sheet].select({}))} facts)")
+            for name in args.stages:
+                try:
+                    result = measure(stages[name], args.repeat)
+                except Exception as e:
+                    # Export needs Kaleido and a Chrome; the other stages must run
+                    if name != 'export':
+                        raise
+                    print(f"  {name:<12} skipped ({type(e).__name__}: {str(e).strip().splitlines()[0]})")
+                    continue
+
+                results[key][name] = result
+                before = before_workbook.get(key, {}).get(name, {})
+                change = f" ({result['ms'] / before['ms'] - 1:+.0%} vs baseline)" if before else ''
+                print(f"  {name:<12} {result['ms']:10.3f} ms {result['peak_kib']:10.1f} KiB{change}")
+                if before and result['ms'] > before['ms'] * TOLERANCE and result['ms'] - before['ms'] > SLACK_MS:
+                    failures.append(f"{key} {name} took {result['ms']} ms, baseline {before['ms']} ms")
+                if (before and result['peak_kib'] > before['peak_kib'] * MEMORY_TOLERANCE
+                        and result['peak_kib'] - before['peak_kib'] > SLACK_KIB):
+                    failures.append(f"{key} {name} peaked at {result['peak_kib']} KiB, baseline {before['peak_kib']} KiB")
+
+    if args.save:
+        merged = {key: {**before_workbook.get(key, {}), **stages} for key, stages in results.items()}
+        with open(BASELINE, 'w') as f:
+            json.dump({**baseline, workbook: {**before_workbook, **merged}}, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
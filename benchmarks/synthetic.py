@@ -0,0 +1,149 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import product
+from math import prod
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+
+from snapshot import FY_LABEL, MONTHS, WORKBOOK  # noqa: E402
+
+# Synthetic, scaled-up copies of price_data.xlsx for scale testing.
+#
+# Every sheet keeps the exact layout the pages melt (its own dimension
+# columns followed by Apr..Mar), and its rows are replicated along the axes
+# that grow in production: more financial years, more model runs and more
+# states, varieties or shrimp counts. Each axis gets a multiplier, grown one
+# step at a time on the least grown axis until the sheet has at least
+# --scale times its rows, and every row is copied once per combination:
+#   Financial Year  earlier years in the label's own format ("2019-20", ...)
+#   Model           "Predicted May (run 2)", ...; Actual rows are not copied
+#   State, ...      "Punjab 2", "Punjab 3", ...
+# Copies of a series are scaled by one random factor, shared by its actuals
+# and forecasts so that the forecast accuracy of a copy stays that of the
+# original. Text and blank cells are copied as they are, so the
+# validation report scales too. The originals are kept unchanged, so the
+# page defaults still resolve.
+#
+#   python benchmarks/synthetic.py --scale 10 100 1000
+#   python benchmarks/pipeline.py --workbook /tmp/price_data_synthetic/price_data_x100.xlsx
+
+OUT_DIR = os.path.join(tempfile.gettempdir(), 'price_data_synthetic')
+
+# Largest change of a copied series against the original
+SERIES_SPREAD = 0.15
+
+
+def shift_fy(label, years):
+    """The financial year label `years` years earlier, written the way the label is."""
+    match = FY_LABEL.match(str(label))
+    if match is None:
+        return label
+    start = int(match.group(1)) - years
+    # A financial year always ends in the calendar year after it starts
+    end = str(start + 1)[-len(match.group(2)):]
+    return label[:match.start(1)] + str(start) + label[match.end(1):match.start(2)] + end + label[match.end(2):]
+
+
+def axis_multipliers(axes, scale, actual_rows=0, other_rows=1):
+    """{axis: number of copies}, grown on the least grown axis until the rows reach scale times."""
+    copies = {axis: 1 for axis in axes}
+
+    def rows():
+        # Actual rows are not copied along the Model axis
+        return actual_rows * prod(n for axis, n in copies.items() if axis != 'Model') + other_rows * prod(copies.values())
+
+    while rows() < scale * (actual_rows + other_rows):
+        copies[min(axes, key=lambda axis: copies[axis])] += 1
+    return copies
+
+
+def copy_label(axis, label, k, fy_span):
+    if k == 0:
+        return label
+    if axis == 'Financial Year':
+        return shift_fy(label, k * fy_span)
+    if axis == 'Model':
+        return f"{label} (run {k + 1})"
+    return f"{label} {k + 1}"
+
+
+def synthetic_rows(df, scale, rng):
+    """Header and rows of a scaled copy of one sheet; returns (header, row iterator, multipliers)."""
+    dims = [c for c in df.columns if c not in MONTHS]
+    axes = [dim for dim in dims if dim != 'Graph Type']
+    actual_rows = int((df['Model'] == 'Actual').sum()) if 'Model' in df.columns else 0
+    copies = axis_multipliers(axes, scale, actual_rows, len(df) - actual_rows)
+    starts = [int(m.group(1)) for m in map(FY_LABEL.match, df['Financial Year'].astype(str)) if m]
+    fy_span = max(starts) - min(starts) + 1 if starts else 1
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    factors = {}
+
+    def rows():
+        for combo in product(*(range(copies[axis]) for axis in axes)):
+            picked = dict(zip(axes, combo))
+            # One factor per copied series, shared by its actuals and forecasts
+            series = tuple(k for axis, k in picked.items() if axis != 'Model')
+            if any(series) and series not in factors:
+                factors[series] = 1 + rng.uniform(-SERIES_SPREAD, SERIES_SPREAD)
+            for record in records:
+                if record.get('Model') == 'Actual' and picked.get('Model'):
+                    continue
+                row = [copy_label(dim, record[dim], picked.get(dim, 0), fy_span) for dim in dims]
+                for month in MONTHS:
+                    value = record[month]
+                    if any(series) and isinstance(value, (int, float)) and not isinstance(value, bool):
+                        value = round(value * factors[series], 2)
+                    row.append(value)
+                yield row
+
+    return [*dims, *MONTHS], rows(), copies
+
+
+def write_workbook(source, path, scale, seed=0, sheets=None):
+    """Write a copy of the source workbook scaled `scale` times; returns {sheet: (rows, multipliers)}."""
+    rng = random.Random(seed)
+    book = Workbook(write_only=True)
+    summary = {}
+    for sheet, df in pd.read_excel(source, sheet_name=sheets).items():
+        header, rows, copies = synthetic_rows(df, scale, rng)
+        ws = book.create_sheet(sheet)
+        ws.append(header)
+        count = 0
+        for row in rows:
+            ws.append(row)
+            count += 1
+        summary[sheet] = (count, copies)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    book.save(path)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write scaled-up synthetic copies of the price workbook.")
+    parser.add_argument('--scale', type=int, nargs='+', default=[10, 100, 1000], help="scale factors (default: 10 100 1000)")
+    parser.add_argument('--source', default=os.path.join(ROOT, WORKBOOK), help="workbook to scale (default: price_data.xlsx)")
+    parser.add_argument('--out', default=OUT_DIR, help=f"output folder (default: {OUT_DIR})")
+    parser.add_argument('--sheets', nargs='*', help="only these sheets (default: all)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args()
+
+    for scale in args.scale:
+        path = os.path.join(args.out, f"{os.path.splitext(os.path.basename(args.source))[0]}_x{scale}.xlsx")
+        start = time.perf_counter()
+        summary = write_workbook(args.source, path, scale, args.seed, args.sheets)
+        total = sum(rows for rows, _ in summary.values())
+        print(f"{path}: {total} rows, {os.path.getsize(path) / 1e6:.1f} MB in {time.perf_counter() - start:.1f}s")
+        for sheet, (rows, copies) in summary.items():
+            print(f"  {sheet:<16} {rows:8} rows  " + ', '.join(f"{axis} x{n}" for axis, n in copies.items()))
+
+
+if __name__ == "__main__":
+    main()
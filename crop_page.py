@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from accuracy import crop_accuracy
+from accuracy_engine import computed_accuracy
+from data_store import current_dataset
+from figure_cache import cached_figure
+from figures import build_figure
+from metrics import FIGURE_BUILD_SECONDS
+from profiling import span
+from slice_cache import get_slice, selection_key
+
+# Generic crop page: sidebar filters, price/arrival chart and accuracy table
+# for any entry of crops.CROPS.
+
+# Rows of the metrics table: the accuracy.xlsx column filling the "Value"
+# cell (None where the sheet has no such metric) and the accuracy_engine
+# metric filling the "Computed" cell
+ACCURACY_ROWS = [
+    ('Next Month Model Accuracy', 'NextMonth', 'next_month'),
+    ('3rd Month Model Accuracy', '3monthaccuracy', 'month_3'),
+    ('6th Month Model Accuracy', '6monthaccuracy', 'month_6'),
+    ('Seasonal Model Accuracy', None, 'seasonal'),
+    ('3 Month Average Accuracy', None, 'avg_3'),
+    ('6 Month Average Accuracy', None, 'avg_6'),
+    ('Next Month Directional Accuracy', 'DirectionalAccuracy', 'directional'),
+]
+
+
+def percent(value):
+    return '-- %' if pd.isna(value) else f"{value:.1%}".replace('%', ' %')
+
+
+def accuracy_table(crop, dataset=None):
+    metrics = crop_accuracy(crop.key)
+    computed = computed_accuracy(crop.key, dataset)
+    lines = [
+        "| Metric                          | Value      | Computed   |",
+        "|----------------------------------|:----------:|:----------:|",
+    ]
+    for label, column, metric in ACCURACY_ROWS:
+        value = percent(metrics.get(column, float('nan')))
+        lines.append(f"| {label:<32} | {value:<10} | {percent(computed[metric]):<10} |")
+    return '\n'.join(lines)
+
+
+def default_selection(crop, latest_model_run):
+    return {
+        'Graph Type': crop.default_graph_types,
+        'Financial Year': list(crop.default_fy),
+        'Model': ["Actual", latest_model_run],
+        **crop.default_dims,
+    }
+
+
+def crop_graph(crop, graph_types, groups, showlegend=True):
+    with span('build_figure'):
+        return build_figure(
+            groups, graph_types, title=crop.chart_title,
+            showlegend=showlegend, arrival_axis=crop.has_arrival
+        )
+
+
+def crop_figure(crop, selection, showlegend=True, dataset=None):
+    """Chart for a selection, served from the figure cache when possible."""
+    dataset = dataset or current_dataset()
+    key = (crop.key, dataset.sheet_version(crop.sheet), selection_key(selection), showlegend)
+
+    def build():
+        with FIGURE_BUILD_SECONDS.time(crop=crop.key):
+            return crop_graph(
+                crop, selection['Graph Type'], get_slice(crop.sheet, selection, dataset).groups, showlegend
+            )
+
+    with span('figure'):
+        return cached_figure(key, build)
+
+
+def invalid_cells(crop, selection, dataset=None):
+    """Cells of the selection that are not numbers, from the ingest-time validation report."""
+    report = (dataset or current_dataset()).validation(crop.sheet)
+    mask = np.ones(len(report), dtype=bool)
+    for dim, values in selection.items():
+        mask &= report[dim].isin([str(v) for v in values]).to_numpy()
+    return report[mask]
+
+
+def sidebar_filters(crop, categories, defaults):
+    st.sidebar.header("Filter Options")
+    return {
+        dim: st.sidebar.multiselect(dim, options=categories[dim], default=defaults[dim])
+        for dim in ['Graph Type', 'Financial Year', 'Model', *crop.dims]
+    }
+
+
+def render(crop, latest_model_run):
+    # Every read below comes from the same data version
+    dataset = current_dataset()
+    with span('sidebar'):
+        selection = sidebar_filters(crop, dataset.categories(crop.sheet), default_selection(crop, latest_model_run))
+
+    # Filter data based on selections
+    selected = get_slice(crop.sheet, selection, dataset)
+    filtered_df = selected.frame
+
+    # Warn if any selected cells could not be converted (checked once at ingest)
+    with span('validation'):
+        invalid = invalid_cells(crop, selection, dataset)
+    if len(invalid):
+        rows = ', '.join(f"{row.Month} in row {row.Row}" for row in invalid.head(5).itertuples())
+        more = f" and {len(invalid) - 5} more" if len(invalid) > 5 else ""
+        st.warning(
+            f"Some values in the 'Value' column could not be converted to numbers and are set as NaN "
+            f"(sheet '{crop.sheet}': {rows}{more})."
+        )
+
+    st.title(crop.page_title)
+
+    if filtered_df.empty:
+        st.warning("No data available for the selected filters.")
+    else:
+        fig = crop_figure(crop, selection, dataset=dataset)
+        # Plotly serialisation of the figure happens here
+        with span('chart'):
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.markdown("## Model Accuracy Metrics")
+        with span('accuracy'):
+            st.markdown(accuracy_table(crop, dataset))
+
+
+def crop_page(crop, latest_model_run):
+    """Return the st.Page that renders a crop."""
+    def page():
+        render(crop, latest_model_run)
+
+    # Keep the URLs of the former dashboard_<crop>.py pages
+    return st.Page(page, title=crop.nav_title, url_path=f"dashboard_{crop.key}")
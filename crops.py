@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+
+# Registry of the crops shown by the dashboard.
+#
+# Everything that used to differ between the nine dashboard_*.py copies lives
+# here: the workbook sheet, the sheet's own dimension columns and the
+# default sidebar selection. crop_page renders any of them.
+#
+# Pages and navigation both read their run metadata from here, so keep this
+# module free of streamlit and data imports.
+
+# Forecast run shown next to "Actual" by default
+LATEST_MODEL_RUN = 'Predicted Mid July'
+
+
+@dataclass(frozen=True)
+class Crop:
+    key: str                  # used for URLs and image names
+    nav_title: str            # label in the navigation menu
+    name: str                 # used in page and chart titles
+    sheet: str                # sheet in price_data.xlsx
+    dims: tuple               # sheet-specific dimension columns, in sidebar order
+    default_fy: tuple
+    default_dims: dict = field(default_factory=dict)
+    has_arrival: bool = True
+
+    @property
+    def default_graph_types(self):
+        return ['Price', 'Arrival'] if self.has_arrival else ['Price']
+
+    @property
+    def page_title(self):
+        return f"{self.name} Price and Arrival Trend" if self.has_arrival else f"{self.name} Price Trend"
+
+    @property
+    def chart_title(self):
+        return f"Monthly {self.page_title}"
+
+
+CROPS = {crop.key: crop for crop in [
+    Crop(
+        key='wheat', nav_title='Wheat', name='Wheat', sheet='wheat',
+        dims=('Variety', 'State'),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'Variety': ['Raj'], 'State': ['Madhya Pradesh']},
+    ),
+    Crop(
+        key='soya', nav_title='Soya', name='Soya', sheet='soya',
+        dims=('State',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'State': ['Madhya Pradesh']},
+    ),
+    Crop(
+        key='chana', nav_title='Chana', name='Chana', sheet='chana',
+        dims=('State',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'State': ['Madhya Pradesh']},
+    ),
+    Crop(
+        key='basmati', nav_title='Basmati', name='Basmati Paddy', sheet='basmati paddy',
+        dims=('State',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'State': ['Uttar Pradesh']},
+    ),
+    Crop(
+        key='finepaddy', nav_title='Fine Paddy', name='Fine Paddy', sheet='fine paddy',
+        dims=('State',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'State': ['Uttar Pradesh']},
+    ),
+    Crop(
+        key='maize', nav_title='Maize', name='Maize', sheet='maize',
+        dims=('State',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'State': ['Madhya Pradesh']},
+    ),
+    Crop(
+        key='shrimp', nav_title='Aqua', name='Shrimp', sheet='shrimp',
+        dims=('Count',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'Count': ['60C']},
+        has_arrival=False,
+    ),
+    Crop(
+        key='coffee', nav_title='Coffee', name='Coffee', sheet='coffee',
+        dims=('Variety',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'Variety': ['Arabica Parchment']},
+        has_arrival=False,
+    ),
+    Crop(
+        key='chili', nav_title='Chili', name='Chili', sheet='chili',
+        dims=('Variety',),
+        default_fy=('2025-26', '2024-25'),
+        default_dims={'Variety': ['Teja', 'Overall']},
+    ),
+]}
+
+# Navigation menu sections, in menu order
+PAGE_GROUPS = {
+    "VAAP": ('shrimp', 'coffee', 'chili'),
+    "OGP": ('wheat', 'soya', 'chana', 'basmati', 'finepaddy', 'maize'),
+}
@@ -0,0 +1,287 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from crops import CROPS
+from dimension_index import DimensionIndex
+from metrics import DATASET_BYTES, WORKBOOK_LOAD_SECONDS, WORKBOOK_LOADS
+from profiling import span
+from snapshot import WORKBOOK, build_snapshot, read_sheet, read_validation
+
+# Process-wide, read-only store of melted sheets.
+#
+# The workbook is read once (through the Parquet snapshot) and held with
+# st.cache_resource, so every session and every rerun gets the very same
+# frames instead of a freshly unpickled copy from st.cache_data. Because the
+# frames are shared they are frozen: assigning columns, replacing or renaming
+# an axis, writing through .loc/.iloc or using inplace=True raises instead of
+# silently changing the data for every other user. Anything derived from a frozen frame (filters,
+# copies, groupbys) is an ordinary, writable DataFrame.
+#
+# Frames, indexes and validation reports are cached per sheet version (a hash
+# of the sheet's cells, see snapshot.py), so when the workbook changes only
+# the sheets that actually changed are reloaded; everything keyed on the
+# version of an unchanged sheet (slices, figures, accuracy) stays valid.
+#
+# A Dataset is one immutable version of the whole workbook. The entry script
+# pins the newest one in session state at the start of every rerun and the
+# pages read only from it, so a reload during a rerun cannot hand them a mix
+# of versions. The per-sheet caches keep the current and the previous
+# version of every sheet whether or not a session still has it pinned; older
+# versions are freed once no session has them pinned any more.
+#
+# PRICE_DATA_BACKEND=sqlite swaps the resident frames for an embedded
+# database queried per selection (see fact_store.py); pages only go through
+# the Dataset interface and work the same on both.
+
+
+class ReadOnlyError(TypeError):
+    pass
+
+
+def _read_only(*args, **kwargs):
+    raise ReadOnlyError(
+        "Dataset frames are shared between sessions and cannot be modified; "
+        "filter or .copy() the frame first."
+    )
+
+
+class _ReadOnlyIndexer:
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __call__(self, *args, **kwargs):
+        return _ReadOnlyIndexer(self._indexer(*args, **kwargs))
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __getattr__(self, name):
+        # pandas reads through .loc/.iloc internally and needs the real indexer
+        return getattr(self._indexer, name)
+
+    __setitem__ = _read_only
+
+
+class FrozenFrame(pd.DataFrame):
+
+    @property
+    def _constructor(self):
+        # Results of operations on a frozen frame are plain DataFrames
+        return pd.DataFrame
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+    def __setattr__(self, name, value):
+        if name in ('index', 'columns'):
+            _read_only()
+        super().__setattr__(name, value)
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    insert = _read_only
+    pop = _read_only
+    _update_inplace = _read_only
+    # Every axis change ends here (rename, rename_axis, set_axis, set_index
+    # and reset_index with inplace=True), before the shared frame is touched
+    _set_axis = _read_only
+
+
+def freeze(df):
+    frozen = FrozenFrame(df)
+    # Mark the backing numpy buffers read-only as well, so views handed out
+    # by .to_numpy() / .values cannot be written through either
+    for arr in frozen._mgr.arrays:
+        arr = getattr(arr, '_ndarray', arr)
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+    return frozen
+
+
+def file_key(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+# Two versions of every sheet: the current one and the one it replaced
+SHEET_CACHE_ENTRIES = 2 * len({crop.sheet for crop in CROPS.values()})
+
+_PIN = '_dataset'
+
+# 'memory' (default) or 'sqlite'
+BACKEND = os.environ.get('PRICE_DATA_BACKEND', 'memory')
+
+
+@dataclass(frozen=True, eq=False)
+class Dataset:
+    """One immutable version of the workbook: frozen frames and validation reports per sheet."""
+    path: str
+    version: str              # hash of all sheet versions, for cross-sheet caches
+    versions: MappingProxyType
+    frames: MappingProxyType
+    reports: MappingProxyType
+
+    def sheet_version(self, sheet):
+        return self.versions[sheet]
+
+    def sheet(self, sheet):
+        return self.frames[sheet]
+
+    def index(self, sheet):
+        """DimensionIndex of a sheet, built once per sheet version."""
+        return _build_index(sheet, self.versions[sheet], self.frames[sheet])
+
+    def categories(self, sheet):
+        """{dimension: its categories} of a sheet, the options of its filters."""
+        frame = self.frames[sheet]
+        return {dim: frame[dim].cat.categories for dim in frame.columns if dim not in ('Month', 'Value')}
+
+    def validation(self, sheet):
+        """Cells of a sheet that are not numbers (Row, dimensions, Month, Raw)."""
+        return self.reports[sheet]
+
+    def memory_usage(self):
+        """{'frames': bytes, 'validation': bytes} held by this version."""
+        return {
+            'frames': int(sum(df.memory_usage(deep=True).sum() for df in self.frames.values())),
+            'validation': int(sum(df.memory_usage(deep=True).sum() for df in self.reports.values())),
+        }
+
+
+@st.cache_resource(max_entries=SHEET_CACHE_ENTRIES, show_spinner=False)
+def _load_frame(sheet, version):
+    return freeze(read_sheet(sheet, version))
+
+
+@st.cache_resource(max_entries=SHEET_CACHE_ENTRIES, show_spinner=False)
+def _load_validation(sheet, version):
+    return freeze(read_validation(sheet, version))
+
+
+@st.cache_resource(max_entries=SHEET_CACHE_ENTRIES, show_spinner=False)
+def _build_index(sheet, version, _df):
+    return DimensionIndex(_df, dims=[c for c in _df.columns if c not in ('Month', 'Value')])
+
+
+def _build_dataset(path):
+    versions = build_snapshot(path)
+    fields = dict(
+        path=path,
+        version=hashlib.sha256(repr(sorted(versions.items())).encode()).hexdigest()[:16],
+        versions=MappingProxyType(versions),
+        reports=MappingProxyType({sheet: _load_validation(sheet, v) for sheet, v in versions.items()}),
+    )
+    if BACKEND == 'sqlite':
+        from fact_store import FactDataset, open_tables
+
+        return FactDataset(tables=MappingProxyType(open_tables(versions)), **fields)
+    if BACKEND != 'memory':
+        raise ValueError(f"unknown PRICE_DATA_BACKEND {BACKEND!r}, expected 'memory' or 'sqlite'")
+    # Everything is loaded up front: the snapshot files of a version are
+    # pruned once it is replaced, while sessions may still have it pinned.
+    # Unchanged sheets come straight from the per-version caches.
+    return Dataset(
+        frames=MappingProxyType({sheet: _load_frame(sheet, v) for sheet, v in versions.items()}),
+        **fields,
+    )
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _open_dataset(key):
+    # Only a new workbook version gets here, cache hits are not timed
+    with span('load'):
+        try:
+            with WORKBOOK_LOAD_SECONDS.time():
+                dataset = _build_dataset(key[0])
+        except Exception:
+            WORKBOOK_LOADS.inc(result='error')
+            raise
+    WORKBOOK_LOADS.inc(result='ok')
+    for kind, size in dataset.memory_usage().items():
+        DATASET_BYTES.set(size, backend=BACKEND, kind=kind)
+    return dataset
+
+
+def latest_dataset(path=WORKBOOK):
+    """Return the newest Dataset of the workbook, publishing a new one if the file changed."""
+    # Replacing the single cache entry is the atomic swap: readers get either
+    # the old or the new Dataset, never a mix
+    return _open_dataset(file_key(path))
+
+
+def pin_dataset(path=WORKBOOK):
+    """Pin the newest Dataset for the rest of this rerun; call once at the top of the entry script."""
+    dataset = latest_dataset(path)
+    st.session_state[_PIN] = dataset
+    return dataset
+
+
+def current_dataset(path=WORKBOOK):
+    """The Dataset pinned for this rerun, or the newest one outside of a pinned rerun."""
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        pinned = st.session_state.get(_PIN)
+        if pinned is not None and pinned.path == os.path.abspath(path):
+            return pinned
+    return latest_dataset(path)
+
+
+if __name__ == "__main__":
+    # Guard check: every write to a shared frame raises, every read works
+    dataset = latest_dataset()
+    failed = False
+    for sheet in dataset.versions:
+        df = dataset.sheet(sheet)
+        writes = {
+            "df['Value'] = 0": lambda: df.__setitem__('Value', 0),
+            "df.loc[i, 'Value'] = 0": lambda: df.loc.__setitem__((df.index[0], 'Value'), 0),
+            "df.iloc[0, -1] = 0": lambda: df.iloc.__setitem__((0, -1), 0),
+            "df.columns = ...": lambda: setattr(df, 'columns', [c.upper() for c in df.columns]),
+            "df.index = ...": lambda: setattr(df, 'index', df.index[::-1]),
+            "df.rename(inplace=True)": lambda: df.rename(columns={'Value': 'V'}, inplace=True),
+            "df.rename_axis(inplace=True)": lambda: df.rename_axis('x', inplace=True),
+            "df.reset_index(inplace=True)": lambda: df.reset_index(drop=True, inplace=True),
+            "df.to_numpy()[0] = 0": lambda: df['Value'].to_numpy().__setitem__(0, 0),
+        }
+        reads = {
+            "df.iloc[:, 0:2]": lambda: df.iloc[:, 0:2],
+            "df.loc[:, 'Month':'Value']": lambda: df.loc[:, 'Month':'Value'],
+            "df.loc[mask, ['Value']]": lambda: df.loc[df['Value'] > 0, ['Value']],
+            "df.at[i, 'Value']": lambda: df.at[df.index[0], 'Value'],
+            "df.iat[0, -1]": lambda: df.iat[0, -1],
+        }
+        failures = []
+        for name, write in writes.items():
+            try:
+                write()
+                failures.append(f"{name} was allowed")
+            except (ReadOnlyError, ValueError):
+                pass
+        for name, read in reads.items():
+            try:
+                read()
+            except Exception as e:
+                failures.append(f"{name} failed: {type(e).__name__}: {e}")
+        print(f"{sheet:<16} " + ('; '.join(failures) if failures else 'ok'))
+        failed = failed or bool(failures)
+    if failed:
+        raise SystemExit(1)
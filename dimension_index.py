@@ -0,0 +1,48 @@
+from itertools import product
+from math import prod
+
+import numpy as np
+
+# Precomputed lookup from sidebar selections to rows of a melted sheet.
+#
+# The pages used to AND one full-column isin() mask per multiselect on every
+# rerun. The index groups the rows once by every observed combination of the
+# dimension columns, so a selection resolves by looking up the requested
+# combinations and its cost follows the size of the selection, not the size
+# of the sheet.
+
+
+class DimensionIndex:
+
+    def __init__(self, df, dims):
+        self.frame = df
+        self.dims = list(dims)
+        # {(graph type, financial year, model, state, ...): row positions}
+        self._rows = df.groupby(self.dims, observed=True, sort=False).indices
+        if len(self.dims) == 1:
+            self._rows = {(key,): rows for key, rows in self._rows.items()}
+
+    def positions(self, selection):
+        """Sorted row positions matching {dim: selected values}; missing dims match anything."""
+        wanted = [selection.get(dim) for dim in self.dims]
+        if any(values is not None and len(values) == 0 for values in wanted):
+            return np.empty(0, dtype=np.intp)
+
+        if None not in wanted and prod(len(values) for values in wanted) <= len(self._rows):
+            # Few enough combinations to look each of them up directly
+            hits = [self._rows.get(key) for key in product(*wanted)]
+        else:
+            # Wide selection: test the observed combinations instead
+            sets = [None if values is None else set(values) for values in wanted]
+            hits = [
+                rows for key, rows in self._rows.items()
+                if all(s is None or k in s for k, s in zip(key, sets))
+            ]
+
+        hits = [rows for rows in hits if rows is not None]
+        if not hits:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(hits))
+
+    def select(self, selection):
+        return self.frame.take(self.positions(selection))
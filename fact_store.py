@@ -0,0 +1,219 @@
+import json
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from data_store import freeze
+from snapshot import MONTH_DTYPE, SNAPSHOT_DIR, read_sheet
+
+# Optional SQLite backend for the price facts (PRICE_DATA_BACKEND=sqlite).
+#
+# The in-memory backend keeps every melted sheet resident. Here each sheet
+# version is loaded once from its Parquet snapshot into one facts table of an
+# embedded database, one row per (crop sheet, graph type, financial year,
+# model, state/variety/count, month) with its value. Dimensions are stored as
+# integer codes into their categories (kept in sheet order), and the
+# composite index on (sheet version, graph type, model, financial year)
+# covers the filters every page and tile query carries. Selections are
+# pushed down as indexed queries and come back as the same categorical
+# frames DimensionIndex.select returns, so only the slice and figure caches
+# on top (both size-bounded) hold data in memory.
+#
+# The newest KEEP_VERSIONS versions of a sheet stay in the database, enough
+# for sessions still pinned on the Dataset a reload replaced.
+
+FACT_DB = os.path.join(SNAPSHOT_DIR, '.facts.sqlite')
+KEEP_VERSIONS = 2
+
+# Frame dimension: facts column
+COLUMNS = {
+    'Graph Type': 'graph_type',
+    'Financial Year': 'financial_year',
+    'Model': 'model',
+    'State': 'state',
+    'Variety': 'variety',
+    'Count': 'count',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheets (
+    id INTEGER PRIMARY KEY,
+    sheet TEXT NOT NULL,
+    version TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    UNIQUE (sheet, version)
+);
+CREATE TABLE IF NOT EXISTS categories (
+    sheet_id INTEGER NOT NULL,
+    dim TEXT NOT NULL,
+    code INTEGER NOT NULL,
+    label,
+    PRIMARY KEY (sheet_id, dim, code)
+);
+CREATE TABLE IF NOT EXISTS facts (
+    sheet_id INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    graph_type INTEGER,
+    financial_year INTEGER,
+    model INTEGER,
+    state INTEGER,
+    variety INTEGER,
+    "count" INTEGER,
+    month INTEGER NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS facts_selection ON facts (sheet_id, graph_type, model, financial_year);
+"""
+
+
+def _connect(db):
+    # One short-lived connection per call: sessions run on their own threads
+    return sqlite3.connect(db, timeout=30, isolation_level=None)
+
+
+class FactTable:
+    """One sheet version in the database; select() answers like DimensionIndex.select."""
+
+    def __init__(self, db, sheet_id, columns, categories):
+        self.db = db
+        self.sheet_id = sheet_id
+        self.columns = list(columns)
+        self.dims = [c for c in self.columns if c not in ('Month', 'Value')]
+        self.categories = categories    # {dim: pd.Index of its labels}
+        self._dtypes = {dim: pd.CategoricalDtype(labels) for dim, labels in categories.items()}
+        self._codes = {dim: {label: code for code, label in enumerate(labels)} for dim, labels in categories.items()}
+
+    def select(self, selection):
+        """Rows matching {dim: selected values}, in sheet order; missing dims match anything."""
+        where, params = ['sheet_id = ?'], [self.sheet_id]
+        for dim in self.dims:
+            values = selection.get(dim)
+            if values is None:
+                continue
+            codes = [self._codes[dim][v] for v in values if v in self._codes[dim]]
+            if not codes:
+                return self._frame([])
+            where.append(f'"{COLUMNS[dim]}" IN ({", ".join("?" * len(codes))})')
+            params.extend(codes)
+
+        columns = ', '.join(f'"{COLUMNS[dim]}"' for dim in self.dims)
+        sql = f'SELECT pos, {columns}, month, value FROM facts WHERE {" AND ".join(where)} ORDER BY pos'
+        with closing(_connect(self.db)) as conn:
+            return self._frame(conn.execute(sql, params).fetchall())
+
+    def _frame(self, rows):
+        # NULL codes (blank dimension cells) and values come back as NaN
+        data = np.array(rows, dtype='float64').reshape(len(rows), len(self.dims) + 3)
+        columns = {
+            dim: pd.Categorical.from_codes(np.nan_to_num(data[:, i + 1], nan=-1).astype('int64'), dtype=self._dtypes[dim])
+            for i, dim in enumerate(self.dims)
+        }
+        columns['Month'] = pd.Categorical.from_codes(data[:, -2].astype('int64'), dtype=MONTH_DTYPE)
+        columns['Value'] = data[:, -1].astype('float32')
+        return pd.DataFrame({c: columns[c] for c in self.columns}, index=data[:, 0].astype('int64'))
+
+
+def _load_version(conn, sheet, version, snapshot_dir):
+    df = read_sheet(sheet, version, snapshot_dir)
+    dims = [c for c in df.columns if c not in ('Month', 'Value')]
+    unknown = [dim for dim in dims if dim not in COLUMNS]
+    if unknown:
+        raise ValueError(f"sheet '{sheet}' has dimensions without a facts column: {', '.join(unknown)}")
+
+    codes = [[None if c < 0 else c for c in df[dim].cat.codes.tolist()] for dim in dims]
+    values = [None if v != v else v for v in df['Value'].astype('float64').tolist()]
+    columns = ', '.join(f'"{COLUMNS[dim]}"' for dim in dims)
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        # Another process may have loaded it while we waited for the lock
+        row = conn.execute('SELECT id FROM sheets WHERE sheet = ? AND version = ?', (sheet, version)).fetchone()
+        if row is None:
+            sheet_id = conn.execute(
+                'INSERT INTO sheets (sheet, version, columns) VALUES (?, ?, ?)',
+                (sheet, version, json.dumps(list(df.columns))),
+            ).lastrowid
+            conn.executemany('INSERT INTO categories VALUES (?, ?, ?, ?)', [
+                (sheet_id, dim, code, label)
+                for dim in dims for code, label in enumerate(df[dim].cat.categories.tolist())
+            ])
+            conn.executemany(
+                f'INSERT INTO facts (sheet_id, pos, {columns}, month, value) VALUES ({", ".join("?" * (len(dims) + 4))})',
+                zip([sheet_id] * len(df), range(len(df)), *codes, df['Month'].cat.codes.tolist(), values),
+            )
+            _prune(conn, sheet)
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def _prune(conn, sheet):
+    old = [row[0] for row in conn.execute(
+        'SELECT id FROM sheets WHERE sheet = ? ORDER BY id DESC LIMIT -1 OFFSET ?', (sheet, KEEP_VERSIONS)
+    )]
+    for table, column in (('facts', 'sheet_id'), ('categories', 'sheet_id'), ('sheets', 'id')):
+        conn.executemany(f'DELETE FROM {table} WHERE {column} = ?', [(sheet_id,) for sheet_id in old])
+
+
+def open_tables(versions, db=FACT_DB, snapshot_dir=SNAPSHOT_DIR):
+    """{sheet: FactTable} of the given sheet versions, loading the ones the database does not have yet."""
+    os.makedirs(os.path.dirname(db) or '.', exist_ok=True)
+    with closing(_connect(db)) as conn:
+        # WAL: readers keep querying while a new version is written
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(_SCHEMA)
+        tables = {}
+        for sheet, version in versions.items():
+            query = 'SELECT id, columns FROM sheets WHERE sheet = ? AND version = ?'
+            row = conn.execute(query, (sheet, version)).fetchone()
+            if row is None:
+                _load_version(conn, sheet, version, snapshot_dir)
+                row = conn.execute(query, (sheet, version)).fetchone()
+            sheet_id, columns = row[0], json.loads(row[1])
+            labels = {}
+            for dim, label in conn.execute(
+                'SELECT dim, label FROM categories WHERE sheet_id = ? ORDER BY dim, code', (sheet_id,)
+            ):
+                labels.setdefault(dim, []).append(label)
+            categories = {dim: pd.Index(labels.get(dim, [])) for dim in columns if dim not in ('Month', 'Value')}
+            tables[sheet] = FactTable(db, sheet_id, columns, categories)
+    return tables
+
+
+@dataclass(frozen=True, eq=False)
+class FactDataset:
+    """data_store.Dataset whose facts are queried from SQLite instead of held in memory."""
+    path: str
+    version: str
+    versions: MappingProxyType
+    tables: MappingProxyType
+    reports: MappingProxyType
+
+    def sheet_version(self, sheet):
+        return self.versions[sheet]
+
+    def sheet(self, sheet):
+        """The whole sheet, read from the database on every call."""
+        return freeze(self.tables[sheet].select({}))
+
+    def index(self, sheet):
+        return self.tables[sheet]
+
+    def categories(self, sheet):
+        return self.tables[sheet].categories
+
+    def validation(self, sheet):
+        return self.reports[sheet]
+
+    def memory_usage(self):
+        # The facts stay in the database
+        return {
+            'frames': 0,
+            'validation': int(sum(df.memory_usage(deep=True).sum() for df in self.reports.values())),
+        }
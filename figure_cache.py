@@ -0,0 +1,34 @@
+import streamlit as st
+
+from lru import LRUCache
+
+# Cache of finished chart figures keyed by (crop, workbook version, filter
+# selection, legend flag).
+#
+# Most visitors land on a crop's default view, so repeat views reuse the
+# finished go.Figure instead of rebuilding it trace by trace. Entries are
+# weighed by an estimate of the JSON st.plotly_chart sends to the browser
+# (serialising a figure just to weigh it would cost a miss as much again),
+# and evicted least recently used first.
+
+FIGURE_CACHE_BYTES = 32 * 1024 * 1024
+
+# JSON bytes of a crop chart: layout plus each point with its share of the
+# trace around it, measured on the crop pages' figures (within 3 %)
+FIGURE_BASE_BYTES = 3800
+POINT_BYTES = 48
+
+
+def _sizeof(fig):
+    points = sum(len(trace.x) for trace in fig.data if trace.x is not None)
+    return FIGURE_BASE_BYTES + POINT_BYTES * points
+
+
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    return LRUCache(max_bytes=FIGURE_CACHE_BYTES, sizeof=_sizeof)
+
+
+def cached_figure(key, build):
+    """Return the figure cached under key, calling build() on a miss."""
+    return figure_cache().get_or_create(key, build)
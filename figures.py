@@ -0,0 +1,82 @@
+import plotly.graph_objects as go
+
+from snapshot import MONTHS
+
+# Shared trace builder for the crop price/arrival charts.
+#
+# Takes the pre-grouped series of a filtered slice ({(graph type, financial
+# year, model, state/variety/count...): rows sorted by month}) and emits
+# every trace in one pass: arrival bars first, then forecast price lines
+# dashed, then "Actual" price lines solid so they are drawn on top.
+
+
+def build_figure(groups, graph_types, title, showlegend=True, arrival_axis=True):
+    # Only needed on a figure cache miss, so not imported with the page
+    import plotly.colors
+    color_list = plotly.colors.qualitative.Plotly
+
+    fig = go.Figure()
+
+    # Same trace order (and so colours) as a groupby over plain strings
+    ordered = sorted(groups.items(), key=lambda item: tuple(str(k) for k in item[0]))
+
+    arrival, dashed, solid = [], [], []
+    price_idx = 0
+    for key, group in ordered:
+        label = ' - '.join(str(k) for k in key)
+        if key[0] == 'Arrival':
+            if 'Arrival' in graph_types:
+                arrival.append((len(arrival), label, group))
+        elif key[0] == 'Price':
+            # Colours follow the position among all price series
+            (solid if key[2] == 'Actual' else dashed).append((price_idx, label, group))
+            price_idx += 1
+
+    # Plot Arrival bars first (with opacity)
+    for idx, label, group in arrival:
+        color = color_list[idx % len(color_list)]
+        fig.add_trace(go.Bar(
+            x=group['Month'],
+            y=group['Value'],
+            name=label,
+            marker_color=color,
+            yaxis='y2',
+            opacity=0.4,  # Make bars semi-transparent
+            text=group['Value'],
+            textposition='outside',
+            texttemplate='%{text:.0f}'
+        ))
+
+    # Price lines: dashed (model != "Actual") go first (bottom), solid ("Actual") on top
+    for dash, entries in (('dash', dashed), ('solid', solid)):
+        for idx, label, group in entries:
+            color = color_list[idx % len(color_list)]
+            fig.add_trace(go.Scatter(
+                x=group['Month'],
+                y=group['Value'],
+                name=label,
+                mode='lines+markers+text',
+                marker=dict(color=color),
+                line=dict(color=color, dash=dash),
+                yaxis='y1',
+                text=group['Value'],
+                textposition='top center',
+                texttemplate='%{text:.0f}'
+            ))
+
+    layout = dict(
+        xaxis=dict(title='Month', categoryorder='array', categoryarray=MONTHS),
+        yaxis=dict(title='Price', side='left'),
+        legend=dict(x=0.01, y=0.99),
+        showlegend=showlegend,
+        title=title
+    )
+    if arrival_axis:
+        # Dual y-axes, bars grouped under the price lines
+        layout.update(
+            yaxis2=dict(title='Arrival', overlaying='y', side='right'),
+            barmode='group'
+        )
+    fig.update_layout(**layout)
+
+    return fig
@@ -1,24 +1,37 @@
 import streamlit as st
 
+from crop_page import crop_page
+from crops import CROPS, LATEST_MODEL_RUN, PAGE_GROUPS
+from data_store import pin_dataset
+from profiling import page_run, span, start_rerun
+from warmup import start as start_warmup
 
-LATEST_MODEL_RUN = 'Predicted Mid July'
+# Entry point: `streamlit run homepage.py`. Pages never import this module,
+# they get everything they need from crops, so navigation is built once per
+# rerun, here.
 
 st.set_page_config(
 
     layout="wide",
 )
 
+# Timing spans of this rerun (off unless DASHBOARD_PROFILE=1 or ?profile=1)
+start_rerun()
 
-pages={"Homepage":[st.Page("apex.py", title="Homepage")],
-    "VAAP":[st.Page("dashboard_shrimp.py", title="Aqua"), st.Page("dashboard_coffee.py", title="Coffee"), st.Page("dashboard_chili.py", title="Chili")],
-        "OGP":[ 
-                    st.Page("dashboard_wheat.py", title="Wheat"),
-                    st.Page("dashboard_soya.py", title="Soya"),
-                    st.Page("dashboard_chana.py", title="Chana"),
-                    st.Page("dashboard_basmati.py", title="Basmati"),
-                    st.Page("dashboard_finepaddy.py", title="Fine Paddy"),
-                    st.Page("dashboard_maize.py", title="Maize")
-                    ]}
-pg = st.navigation(pages, position="top", expanded=False)
-pg.run()
+# Every page of this rerun reads the same data version, even if the workbook
+# is reloaded halfway through
+with span('dataset'):
+    pin_dataset()
+
+# Warm the other pages in the background (no-op after the first rerun, and
+# when serve.py already started it)
+start_warmup(LATEST_MODEL_RUN)
 
+pages={"Homepage":[st.Page("apex.py", title="Homepage")]}
+for group, keys in PAGE_GROUPS.items():
+    pages[group] = [crop_page(CROPS[key], LATEST_MODEL_RUN) for key in keys]
+
+pg = st.navigation(pages, position="top", expanded=False)
+# The spans are logged even if the page raises or stops early
+with page_run(pg.url_path or '/'):
+    pg.run()
@@ -0,0 +1,181 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Prometheus metrics of the dashboard process.
+#
+# Served as text (exposition format 0.0.4) by status_server.py on
+#   GET /metrics
+# next to /ready and /healthz, so a scrape never goes through Streamlit:
+#   curl -s localhost:8502/metrics
+# Counters and histograms are updated where the work happens (workbook
+# loads in data_store, figure builds in crop_page). Cache statistics,
+# active sessions and memory are read from their owners at scrape time.
+
+# Seconds; a cold workbook load parses every sheet, a figure build is one slice and its traces
+LOAD_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+BUILD_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_METRICS = []
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _header(name, kind, help):
+    return [f'# HELP {name} {help}', f'# TYPE {name} {kind}']
+
+
+class Counter:
+    """Monotonic count per label set."""
+    kind = 'counter'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._values = {}       # sorted label items: count
+        self._lock = threading.Lock()
+        _METRICS.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def lines(self):
+        with self._lock:
+            values = dict(self._values)
+        return _header(self.name, self.kind, self.help) + [
+            f'{self.name}{_format_labels(labels)} {_format_value(value)}' for labels, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Current value per label set."""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """Cumulative buckets, sum and count of observed durations per label set."""
+
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}       # sorted label items: [count per bucket..., sum, count]
+        self._lock = threading.Lock()
+        _METRICS.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            entry = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the block took, if it did not raise."""
+        start = time.perf_counter()
+        yield
+        self.observe(time.perf_counter() - start, **labels)
+
+    def lines(self):
+        with self._lock:
+            values = {key: list(entry) for key, entry in self._values.items()}
+        lines = _header(self.name, 'histogram', self.help)
+        for labels, entry in sorted(values.items()):
+            for bound, count in zip((*self.buckets, float('inf')), (*entry[:-2], entry[-1])):
+                le = _format_labels((*labels, ('le', _format_value(float(bound)))))
+                lines.append(f'{self.name}_bucket{le} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(entry[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {entry[-1]}')
+        return lines
+
+
+WORKBOOK_LOADS = Counter(
+    'dashboard_workbook_loads_total', "Workbook versions opened, by result (ok or error).")
+WORKBOOK_LOAD_SECONDS = Histogram(
+    'dashboard_workbook_load_seconds', "Time to open a workbook version, parsing changed sheets.", LOAD_BUCKETS)
+FIGURE_BUILD_SECONDS = Histogram(
+    'dashboard_figure_build_seconds', "Time to build a chart on a figure cache miss, by crop.", BUILD_BUCKETS)
+DATASET_BYTES = Gauge(
+    'dashboard_dataset_bytes', "Memory held by the newest dataset, by backend and kind (frames or validation).")
+
+
+def _cache_lines():
+    # Imported here: the caches (and Streamlit) are only needed at scrape time
+    from figure_cache import figure_cache
+    from slice_cache import slice_cache
+
+    stats = {'data': slice_cache().stats(), 'figure': figure_cache().stats()}
+    lines = []
+    for field, name, kind, help in (
+        ('hits', 'dashboard_cache_hits_total', 'counter', "Lookups answered from the cache."),
+        ('misses', 'dashboard_cache_misses_total', 'counter', "Lookups that had to build the entry."),
+        ('evictions', 'dashboard_cache_evictions_total', 'counter', "Entries dropped to stay within the size bound."),
+        ('entries', 'dashboard_cache_entries', 'gauge', "Entries in the cache."),
+        ('bytes', 'dashboard_cache_bytes', 'gauge', "Estimated size of the cached entries."),
+        ('max_bytes', 'dashboard_cache_max_bytes', 'gauge', "Size bound of the cache."),
+    ):
+        lines += _header(name, kind, help)
+        lines += [f'{name}{{cache="{cache}"}} {values[field]}' for cache, values in stats.items()]
+    return lines
+
+
+def _session_lines():
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return []
+    # The runtime has no public session count; its session manager does
+    manager = getattr(Runtime.instance(), '_session_mgr', None)
+    if manager is None:
+        return []
+    return _header('dashboard_active_sessions', 'gauge', "Browser sessions connected to the server.") + [
+        f'dashboard_active_sessions {manager.num_active_sessions()}'
+    ]
+
+
+def _process_lines():
+    try:
+        with open('/proc/self/status') as f:
+            rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith('VmRSS:'))
+    except (OSError, StopIteration):
+        return []
+    return _header('process_resident_memory_bytes', 'gauge', "Resident memory of the dashboard process.") + [
+        f'process_resident_memory_bytes {rss}'
+    ]
+
+
+def render():
+    """Every metric in the Prometheus text format."""
+    lines = []
+    for metric in _METRICS:
+        lines += metric.lines()
+    for collect in (_cache_lines, _session_lines, _process_lines):
+        lines += collect()
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# Per-rerun timing spans.
+#
+# The stages of a rerun (dataset load, Excel parsing, filtering, grouping,
+# figure building, Plotly serialisation, ...) are wrapped in named spans:
+#
+#     with span('figure'):
+#         ...
+#
+# homepage.py starts a Profile at the top of every rerun and finishes it at
+# the end, also when the page raised or called st.stop() / st.rerun(). Spans
+# nest, and only the work that actually ran shows up: a cache hit has no
+# parse or figure span. Profiling is off unless
+#   DASHBOARD_PROFILE=1    logs every rerun as one JSON line, or
+#   ?profile=1             shows a sidebar panel with the spans of each
+#                          rerun in this session (?profile=0 hides it).
+# When it is off, span() returns a shared no-op context manager.
+
+LOG_SPANS = os.environ.get('DASHBOARD_PROFILE') == '1'
+PANEL_PARAM = 'profile'
+
+_PANEL_KEY = '_profile_panel'
+_DISABLED = nullcontext()
+_current = ContextVar('profile', default=None)
+
+_LOGGER = logging.getLogger(__name__)
+if LOG_SPANS and not _LOGGER.handlers:
+    # Bare JSON lines, whatever the app's own log format is
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    _LOGGER.addHandler(_handler)
+    _LOGGER.setLevel(logging.INFO)
+    _LOGGER.propagate = False
+
+
+class Profile:
+    """The spans of one rerun."""
+
+    def __init__(self, panel=False):
+        self.panel = panel
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.seconds = None
+        self.spans = []         # [name, depth, start, seconds], seconds from the start of the rerun
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name):
+        record = [name, self._depth, time.perf_counter() - self._start, None]
+        self.spans.append(record)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record[3] = time.perf_counter() - self._start - record[2]
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._start
+
+    def as_dict(self, **fields):
+        return {
+            **fields,
+            'started': round(self.started, 3),
+            'ms': round(self.seconds * 1000, 3),
+            'spans': [
+                {'name': name, 'depth': depth, 'start_ms': round(start * 1000, 3), 'ms': round(seconds * 1000, 3)}
+                for name, depth, start, seconds in self.spans if seconds is not None
+            ],
+        }
+
+
+def span(name):
+    """Time the block as a named span of the current rerun; a no-op when profiling is off."""
+    profile = _current.get()
+    return _DISABLED if profile is None else profile.span(name)
+
+
+def _panel_enabled():
+    import streamlit as st
+
+    value = st.query_params.get(PANEL_PARAM)
+    if value is not None:
+        st.session_state[_PANEL_KEY] = value == '1'
+    return st.session_state.get(_PANEL_KEY, False)
+
+
+def start_rerun():
+    """Start profiling this rerun if it is enabled; call first thing in the entry script."""
+    panel = _panel_enabled()
+    profile = Profile(panel) if LOG_SPANS or panel else None
+    _current.set(profile)
+    return profile
+
+
+def finish_rerun(page='', error=None):
+    """Stop profiling this rerun, log its spans and show them in the sidebar if enabled.
+
+    `error` is the exception that ended the page early, if any (including
+    st.stop() and st.rerun()); it is logged as the rerun's outcome.
+    """
+    profile = _current.get()
+    if profile is None:
+        return
+    _current.set(None)
+    profile.finish()
+    if LOG_SPANS:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx(suppress_warning=True)
+        _LOGGER.info(json.dumps(profile.as_dict(
+            event='rerun', page=page, session=ctx.session_id if ctx else None,
+            outcome='ok' if error is None else type(error).__name__,
+        )))
+    # A rerun asked for by st.rerun() throws its output away
+    if profile.panel and type(error).__name__ != 'RerunException':
+        render_panel(profile)
+
+
+@contextmanager
+def page_run(page):
+    """Time the page as the 'page' span and finish the rerun after it, however the page ended."""
+    try:
+        with span('page'):
+            yield
+    except BaseException as e:
+        finish_rerun(page, e)
+        raise
+    finish_rerun(page)
+
+
+def render_panel(profile):
+    import streamlit as st
+
+    lines = ["| Span | ms |", "|:-----|-----:|"]
+    for name, depth, _, seconds in profile.spans:
+        if seconds is not None:
+            lines.append(f"| {'&nbsp;' * 4 * depth}{name} | {seconds * 1000:.1f} |")
+    with st.sidebar.expander(f"Profile: {profile.seconds * 1000:.0f} ms", expanded=True):
+        st.markdown('\n'.join(lines))
@@ -0,0 +1,48 @@
+import argparse
+import logging
+import os
+
+import status_server
+import warmup
+import watcher
+
+# Production launcher: `python serve.py` instead of `streamlit run homepage.py`.
+#
+# Starts the cache warm-up, the readiness and metrics endpoints and the
+# workbook watcher, then the Streamlit server, all in one process so the
+# warmed st.cache_resource entries are the ones the sessions use. Point the
+# load balancer's health check at http://<host>:<status port>/ready and the
+# Prometheus scraper at http://<host>:<status port>/metrics.
+
+APP = 'homepage.py'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the dashboard with cache warm-up and a readiness endpoint.")
+    parser.add_argument('--port', type=int, default=8501, help="Streamlit port (default: 8501)")
+    parser.add_argument('--status-port', type=int, default=status_server.STATUS_PORT,
+                        help=f"port of /ready, /healthz and /metrics (default: {status_server.STATUS_PORT})")
+    parser.add_argument('--workers', type=int, default=warmup.WARMUP_WORKERS,
+                        help=f"warm-up threads (default: {warmup.WARMUP_WORKERS})")
+    parser.add_argument('--watch-interval', type=float, default=watcher.WATCH_INTERVAL,
+                        help=f"seconds between workbook change checks, 0 to disable (default: {watcher.WATCH_INTERVAL})")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    # Data files are opened relative to the app folder
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    from streamlit.web import bootstrap
+
+    status_server.start(args.status_port)
+    warmup.start(workers=args.workers)
+    if args.watch_interval > 0:
+        watcher.start(interval=args.watch_interval)
+
+    flag_options = {'server_port': args.port, 'server_headless': True}
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(APP, False, [], flag_options)
+
+
+if __name__ == "__main__":
+    main()
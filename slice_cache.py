@@ -0,0 +1,57 @@
+from collections import namedtuple
+
+import streamlit as st
+
+from data_store import current_dataset, freeze
+from lru import LRUCache
+from profiling import span
+
+# Cache of filtered slices keyed by (crop sheet, sheet version, selection).
+#
+# Users flip between a handful of sidebar combinations, so the filtered rows
+# and their per-series groups (each sorted by month) are kept in a shared,
+# size-bounded LRU. Entries are frozen like the store itself because every
+# session that hits the same selection gets the same objects.
+
+SLICE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Leading group keys, the sheet's own dimensions (State, Variety, ...) follow
+GROUP_DIMS = ['Graph Type', 'Financial Year', 'Model']
+
+FilteredSlice = namedtuple('FilteredSlice', ['frame', 'groups'])
+
+
+def _sizeof(entry):
+    frames = [entry.frame, *entry.groups.values()]
+    return int(sum(f.memory_usage(deep=True).sum() for f in frames))
+
+
+@st.cache_resource(show_spinner=False)
+def slice_cache():
+    return LRUCache(max_bytes=SLICE_CACHE_BYTES, sizeof=_sizeof)
+
+
+def selection_key(selection):
+    return tuple(sorted((dim, frozenset(values)) for dim, values in selection.items()))
+
+
+def _build_slice(index, selection):
+    with span('filter'):
+        frame = index.select(selection)
+    dims = GROUP_DIMS + [d for d in index.dims if d not in GROUP_DIMS]
+    with span('groupby'):
+        groups = {
+            key: freeze(group.sort_values('Month'))
+            for key, group in frame.groupby(dims, observed=True)
+        }
+    return FilteredSlice(freeze(frame), groups)
+
+
+def get_slice(sheet, selection, dataset=None):
+    """Return the FilteredSlice of a sheet for {dim: selected values}."""
+    dataset = dataset or current_dataset()
+    key = (sheet, dataset.sheet_version(sheet), selection_key(selection))
+    with span('slice'):
+        return slice_cache().get_or_create(
+            key, lambda: _build_slice(dataset.index(sheet), selection)
+        )
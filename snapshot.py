@@ -0,0 +1,261 @@
+import hashlib
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+
+import pandas as pd
+
+from profiling import span
+
+# Columnar snapshot of price_data.xlsx.
+#
+# Parsing the workbook with openpyxl is the slowest part of a cold page, so
+# every sheet is melted once into a typed Parquet file under
+# SNAPSHOT_DIR/<sheet>/<sheet version>.parquet. An xlsx is a zip with one XML
+# part per sheet, so the version of a sheet is a hash of its own cell data
+# (shared strings and the number formats of its cells resolved) and updating
+# one crop only re-parses that sheet; the other sheets keep their version,
+# their files and every cache keyed on them.
+#
+# Validation happens here too, once per sheet version: values are coerced
+# to numbers (Indian digit grouping and blank cells included), Financial Year
+# labels are normalised to "2025-26", rows with their Variety and State
+# swapped are put back, and every cell that is not a number is recorded in a
+# report stored next to the sheet (<sheet version>.validation.parquet).
+
+WORKBOOK = 'price_data.xlsx'
+SNAPSHOT_DIR = '.snapshots'
+# Bump whenever the melted layout or dtypes change so stale snapshots rebuild
+SNAPSHOT_SCHEMA = 5
+
+MONTHS = ['Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar']
+# Fiscal month order, so sorting and comparisons work on the integer codes
+MONTH_DTYPE = pd.CategoricalDtype(MONTHS, ordered=True)
+
+# Dimension pairs that are sometimes entered the wrong way round
+SWAPPABLE_DIMS = [('Variety', 'State')]
+
+# "2025-26", "2025-2026", "2025 - 2026", "2023 -2024", ...
+FY_LABEL = re.compile(r'^\s*(\d{4})\s*-\s*(\d{2}|\d{4})\s*$')
+
+
+_NS = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+}
+_SHEET_DATA = re.compile(rb'<sheetData\b[^>]*/>|<sheetData\b.*?</sheetData>', re.S)
+_SHARED_CELL = re.compile(rb'(<c\b[^>]*\bt="s"[^>]*>\s*<v>)(\d+)(</v>)')
+_CELL_STYLE = re.compile(rb'(<c\b[^>]*\ss=")(\d+)(")')
+
+
+def _sheet_parts(z):
+    """[(sheet name, zip member of its XML part)] in workbook order."""
+    workbook = ElementTree.fromstring(z.read('xl/workbook.xml'))
+    rels = ElementTree.fromstring(z.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f"{{{_NS['rel']}}}Relationship")}
+    parts = []
+    for sheet in workbook.iter(f"{{{_NS['main']}}}sheet"):
+        target = targets[sheet.get(f"{{{_NS['r']}}}id")]
+        parts.append((sheet.get('name'), target.lstrip('/') if target.startswith('/') else f'xl/{target}'))
+    return parts
+
+
+def _shared_strings(z):
+    if 'xl/sharedStrings.xml' not in z.namelist():
+        return []
+    root = ElementTree.fromstring(z.read('xl/sharedStrings.xml'))
+    return [
+        ''.join(t.text or '' for t in si.iter(f"{{{_NS['main']}}}t")).encode()
+        for si in root.iter(f"{{{_NS['main']}}}si")
+    ]
+
+
+def _cell_formats(z):
+    """Hashed number format of every cell style (cellXfs entry), the only part of a style that changes how a value is read."""
+    if 'xl/styles.xml' not in z.namelist():
+        return []
+    root = ElementTree.fromstring(z.read('xl/styles.xml'))
+    codes = {
+        fmt.get('numFmtId'): fmt.get('formatCode', '')
+        for fmt in root.iterfind('main:numFmts/main:numFmt', _NS)
+    }
+    formats = []
+    for xf in root.iterfind('main:cellXfs/main:xf', _NS):
+        fmt_id = xf.get('numFmtId', '0')
+        code = codes.get(fmt_id, f'builtin {fmt_id}')
+        # Hashed, so the format code cannot clash with the XML around it
+        formats.append(hashlib.sha256(code.encode()).hexdigest()[:16].encode())
+    return formats
+
+
+def sheet_versions(path=WORKBOOK):
+    """Return {sheet name: version} in workbook order, hashing each sheet's XML part.
+
+    `path` may also be an open binary file, so the versions can be taken from
+    the very bytes that are parsed.
+    """
+    with zipfile.ZipFile(path) as z:
+        strings = _shared_strings(z)
+        formats = _cell_formats(z)
+        versions = {}
+        for sheet, part in _sheet_parts(z):
+            data = _SHEET_DATA.search(z.read(part))
+            # Cell styles are resolved to their number format, so a format
+            # Excel appends for a cell elsewhere does not change this sheet
+            cells = _CELL_STYLE.sub(
+                lambda m: m.group(1) + formats[int(m.group(2))] + m.group(3), data.group(0) if data else b''
+            )
+            # Shared strings are resolved, so re-ordering the string table
+            # (which Excel does on save) does not change the other sheets
+            cells = _SHARED_CELL.sub(lambda m: m.group(1) + strings[int(m.group(2))] + m.group(3), cells)
+            h = hashlib.sha256(f'schema={SNAPSHOT_SCHEMA}'.encode())
+            h.update(cells)
+            versions[sheet] = h.hexdigest()[:16]
+    return versions
+
+
+def normalize_fy(labels):
+    """Rewrite Financial Year labels as "2025-26"; labels that do not parse are kept as they are."""
+    parts = labels.astype('string').str.extract(FY_LABEL)
+    start = pd.to_numeric(parts[0])
+    end = pd.to_numeric(parts[1])
+    # Only a label whose second year follows the first one is a financial year
+    valid = (end == start + 1) | (end == (start + 1) % 100)
+    short = start.astype('string') + '-' + ((start + 1) % 100).astype('string').str.zfill(2)
+    return labels.where(~valid.fillna(False), short.astype(object))
+
+
+def fy_start(label):
+    """First calendar year of a financial year label ("2025-26" -> 2025), or None."""
+    match = FY_LABEL.match(str(label))
+    return int(match.group(1)) if match else None
+
+
+def repair_swapped(df, a, b):
+    """Swap back the rows whose `a` value is mostly seen in column `b` and vice versa."""
+    count_a, count_b = df[a].value_counts(), df[b].value_counts()
+
+    def mostly_in(values, counts, other):
+        return other.reindex(values).fillna(0).to_numpy() > counts.reindex(values).fillna(0).to_numpy()
+
+    swapped = mostly_in(df[a], count_a, count_b) & mostly_in(df[b], count_b, count_a)
+    if not swapped.any():
+        return df
+    df = df.copy()
+    df.loc[swapped, [a, b]] = df.loc[swapped, [b, a]].to_numpy()
+    return df
+
+
+def coerce_values(raw):
+    """Return (float32 values, mask of cells that hold something that is not a number)."""
+    if pd.api.types.is_numeric_dtype(raw):
+        return raw.astype('float32'), pd.Series(False, index=raw.index)
+    # ' 1,46,244 ' -> 146244, '    ' -> missing
+    text = raw.astype('string').str.replace(r'[\s,]', '', regex=True)
+    values = pd.to_numeric(text, errors='coerce')
+    failed = (text != '').fillna(False) & values.isna()
+    return values.astype('float32').fillna(float('nan')), failed
+
+
+def melt_sheet(df):
+    """Return the melted, typed sheet and its validation report."""
+    # Everything that is not a month column is a dimension of the sheet
+    id_vars = [c for c in df.columns if c not in MONTHS]
+    if 'Financial Year' in df.columns:
+        df = df.assign(**{'Financial Year': normalize_fy(df['Financial Year'])})
+    for a, b in SWAPPABLE_DIMS:
+        if a in df.columns and b in df.columns:
+            df = repair_swapped(df, a, b)
+    df_melted = df.melt(
+        id_vars=id_vars,
+        value_vars=MONTHS,
+        var_name='Month',
+        value_name='Value'
+    )
+    # Compact schema: dimensions become categoricals (categories kept in
+    # sheet order so the sidebar options read as before), Month follows the
+    # Apr-Mar fiscal order and Value is float32
+    for col in id_vars:
+        df_melted[col] = pd.Categorical(df_melted[col], categories=pd.unique(df_melted[col].dropna()))
+    df_melted['Month'] = df_melted['Month'].astype(MONTH_DTYPE)
+    values, failed = coerce_values(df_melted['Value'])
+
+    # Cells that are not numbers: workbook row (header is row 1), their
+    # dimensions and the raw content
+    report = df_melted.loc[failed, [*id_vars, 'Month']].astype(str)
+    report.insert(0, 'Row', (df_melted.index[failed] % len(df) + 2).astype('int64'))
+    report['Raw'] = df_melted.loc[failed, 'Value'].astype(str)
+
+    df_melted['Value'] = values
+    return df_melted, report.reset_index(drop=True)
+
+
+def _sheet_file(snapshot_dir, sheet, version, kind=''):
+    return os.path.join(snapshot_dir, sheet, f'{version}{kind}.parquet')
+
+
+def build_snapshot(path=WORKBOOK, snapshot_dir=SNAPSHOT_DIR):
+    """Melt the sheets without a snapshot of their current version; returns {sheet: version}."""
+    # Read once: versions and parsed sheets must come from the same save
+    with open(path, 'rb') as f:
+        workbook = io.BytesIO(f.read())
+    versions = sheet_versions(workbook)
+    stale = [sheet for sheet, version in versions.items()
+             if not os.path.exists(_sheet_file(snapshot_dir, sheet, version))]
+
+    if stale:
+        # One openpyxl pass over just the changed sheets
+        with span('parse'):
+            sheets = pd.read_excel(workbook, sheet_name=stale)
+        for sheet, df in sheets.items():
+            os.makedirs(os.path.join(snapshot_dir, sheet), exist_ok=True)
+            with span('melt'):
+                melted, report = melt_sheet(df)
+            # The sheet file is written last: once it exists, the version is complete
+            for frame, kind in ((report, '.validation'), (melted, '')):
+                fd, tmp = tempfile.mkstemp(dir=os.path.join(snapshot_dir, sheet), prefix='.build-')
+                os.close(fd)
+                try:
+                    frame.to_parquet(tmp, index=False)
+                    os.replace(tmp, _sheet_file(snapshot_dir, sheet, versions[sheet], kind))
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+        _prune(snapshot_dir, versions)
+    return versions
+
+
+def _prune(snapshot_dir, versions):
+    for name in os.listdir(snapshot_dir):
+        folder = os.path.join(snapshot_dir, name)
+        if name.startswith('.'):
+            continue
+        if name not in versions:
+            # Removed sheets and snapshots of the former whole-workbook layout
+            shutil.rmtree(folder, ignore_errors=True)
+            continue
+        for file in os.listdir(folder):
+            if not file.startswith(versions[name]) and not file.startswith('.'):
+                os.remove(os.path.join(folder, file))
+
+
+def read_sheet(sheet, version, snapshot_dir=SNAPSHOT_DIR):
+    """Melted frame of one version of a sheet."""
+    return pd.read_parquet(_sheet_file(snapshot_dir, sheet, version))
+
+
+def read_validation(sheet, version, snapshot_dir=SNAPSHOT_DIR):
+    """Report of the cells that are not numbers in one version of a sheet."""
+    return pd.read_parquet(_sheet_file(snapshot_dir, sheet, version, '.validation'))
+
+
+if __name__ == "__main__":
+    for sheet, version in build_snapshot(*sys.argv[1:2]).items():
+        invalid = len(read_validation(sheet, version))
+        print(f"{sheet:<16} {version}" + (f"  {invalid} cell(s) are not numbers" if invalid else ""))
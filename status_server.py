@@ -0,0 +1,58 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import metrics
+import warmup
+
+# Readiness and metrics endpoints for the load balancer and monitoring.
+#
+# Runs next to the Streamlit server in the same process (see serve.py) on
+# its own port:
+#   GET /ready    200 once the warm-up finished, 503 before (or if it failed)
+#   GET /healthz  200 as long as the process is up
+#   GET /metrics  Prometheus text metrics (see metrics.py)
+# /ready and /healthz return the warm-up status as JSON.
+
+STATUS_PORT = 8502
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/ready':
+            self._send_json(200 if warmup.STATUS.ready else 503, warmup.STATUS.as_dict())
+        elif path == '/healthz':
+            self._send_json(200, warmup.STATUS.as_dict())
+        elif path == '/metrics':
+            self._send(200, metrics.CONTENT_TYPE, metrics.render().encode())
+        else:
+            self._send_json(404, {'error': f"unknown path {path}"})
+
+    def _send_json(self, code, payload):
+        self._send(code, 'application/json', json.dumps(payload).encode())
+
+    def _send(self, code, content_type, body):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Probes hit this every few seconds, keep them out of the console
+        _LOGGER.debug(format, *args)
+
+
+def start(port=STATUS_PORT, host=''):
+    """Serve the status endpoints from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), StatusHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='status-server', daemon=True).start()
+    _LOGGER.info("status endpoints on port %d", server.server_address[1])
+    return server
@@ -0,0 +1,121 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from crops import CROPS, LATEST_MODEL_RUN
+
+# Batch renderer for the homepage tile images.
+#
+# Renders the default chart of every crop in one Kaleido/Chromium session
+# and writes content-addressed PNGs (images/<crop>-<png hash>.png). The
+# manifest remembers which data each image was drawn from, so a refresh
+# after a data drop only re-renders the crops whose default view changed.
+
+IMAGE_DIR = 'images'
+MANIFEST = os.path.join(IMAGE_DIR, 'manifest.json')
+
+
+def read_manifest(path=MANIFEST):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def thumbnail_path(crop_key, manifest=None):
+    """Current image of a crop, falling back to the hand-made images/<crop>.png."""
+    entry = (read_manifest() if manifest is None else manifest).get(crop_key)
+    if entry and os.path.exists(os.path.join(IMAGE_DIR, entry['image'])):
+        return os.path.join(IMAGE_DIR, entry['image'])
+    return os.path.join(IMAGE_DIR, f'{crop_key}.png')
+
+
+def data_hash(crop, latest_model_run):
+    """Hash of everything the thumbnail of a crop is drawn from."""
+    from crop_page import default_selection
+    from slice_cache import get_slice
+
+    selection = default_selection(crop, latest_model_run)
+    frame = get_slice(crop.sheet, selection).frame
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    h.update(repr((crop, sorted(selection.items()))).encode())
+    return h.hexdigest()[:16]
+
+
+def _render(figures, paths):
+    import plotly.io as pio
+
+    if hasattr(pio, 'write_images'):
+        # Kaleido >= 1: a single Chromium session for the whole batch
+        pio.write_images(figures, paths, format='png')
+    else:
+        # Older Kaleido keeps one renderer process alive across to_image calls
+        for fig, path in zip(figures, paths):
+            pio.write_image(fig, path, format='png')
+
+
+def render_thumbnails(latest_model_run=LATEST_MODEL_RUN, crops=None, force=False):
+    """Re-render the thumbnails whose data changed and return the crop keys rendered."""
+    from crop_page import crop_figure, default_selection
+
+    manifest = read_manifest()
+    pending = {}
+    for crop in (crops or CROPS.values()):
+        digest = data_hash(crop, latest_model_run)
+        entry = manifest.get(crop.key)
+        if force or not entry or entry['data_hash'] != digest or \
+                not os.path.exists(os.path.join(IMAGE_DIR, entry['image'])):
+            pending[crop.key] = (crop, digest)
+
+    if not pending:
+        return []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = list(pending)
+        paths = [os.path.join(tmp, f'{key}.png') for key in keys]
+        figures = [
+            crop_figure(crop, default_selection(crop, latest_model_run), showlegend=False)
+            for crop, _ in pending.values()
+        ]
+        _render(figures, paths)
+
+        for key, path in zip(keys, paths):
+            with open(path, 'rb') as f:
+                png = f.read()
+            name = f'{key}-{hashlib.sha256(png).hexdigest()[:12]}.png'
+            target = os.path.join(IMAGE_DIR, name)
+            if not os.path.exists(target):
+                with open(target, 'wb') as f:
+                    f.write(png)
+            old = manifest.get(key)
+            if old and old['image'] != name:
+                try:
+                    os.remove(os.path.join(IMAGE_DIR, old['image']))
+                except FileNotFoundError:
+                    pass
+            manifest[key] = {'data_hash': pending[key][1], 'image': name}
+
+    tmp_manifest = MANIFEST + '.tmp'
+    with open(tmp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_manifest, MANIFEST)
+    return keys
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the homepage crop thumbnails.")
+    parser.add_argument('crops', nargs='*', help="crops to render (default: all)")
+    parser.add_argument('--force', action='store_true', help="re-render even if the data is unchanged")
+    args = parser.parse_args()
+    unknown = sorted(set(args.crops) - set(CROPS))
+    if unknown:
+        parser.error(f"unknown crop(s): {', '.join(unknown)}; choose from {', '.join(CROPS)}")
+
+    rendered = render_thumbnails(crops=[CROPS[key] for key in args.crops] or None, force=args.force)
+    print(f"rendered: {', '.join(rendered) or 'nothing, all thumbnails up to date'}")
@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+import pandas as pd
+import streamlit as st
+
+from crops import CROPS
+from data_store import current_dataset
+from snapshot import MONTHS, fy_start
+
+# Headline numbers for the homepage tiles.
+#
+# For each crop the tile follows the headline series of its default view
+# (first default State/Variety/Count) and shows the latest actual price, its
+# month-on-month change, the gap between the latest model run's forecast for
+# the next month and that actual price, and a sparkline of the last twelve
+# actual prices. Model runs repeat the actuals for past months, so the first
+# month after the latest actual is the first real forecast. All crops are
+# aggregated together in one vectorised pass, once per dataset version.
+
+SPARKLINE_MONTHS = 12
+
+Tile = namedtuple('Tile', ['period', 'latest', 'mom_change', 'forecast_period', 'forecast_gap', 'sparkline'])
+
+
+def _headline_rows(crop, latest_model_run, dataset):
+    selection = {
+        'Graph Type': ['Price'],
+        'Model': ['Actual', latest_model_run],
+        **{dim: values[:1] for dim, values in crop.default_dims.items()},
+    }
+    rows = dataset.index(crop.sheet).select(selection)
+    return pd.DataFrame({
+        'Crop': crop.key,
+        'Financial Year': rows['Financial Year'].astype(str).to_numpy(),
+        'Model': rows['Model'].astype(str).to_numpy(),
+        'Month': rows['Month'].cat.codes.to_numpy(),
+        'Value': rows['Value'].to_numpy(),
+    })
+
+
+def _period_label(period):
+    year, month = divmod(int(period), 12)
+    # Months are in fiscal order, Jan-Mar fall in the second calendar year
+    return f"{MONTHS[month]} {year + (1 if month >= 9 else 0)}"
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _tiles(version, latest_model_run, _dataset):
+    facts = pd.concat([_headline_rows(crop, latest_model_run, _dataset) for crop in CROPS.values()], ignore_index=True)
+    facts['Period'] = facts['Financial Year'].map(fy_start) * 12 + facts['Month']
+    facts = facts.dropna(subset=['Period', 'Value'])
+
+    # One row per crop and month with the actual and forecast side by side
+    wide = facts.pivot_table(index=['Crop', 'Period'], columns='Model', values='Value', aggfunc='mean')
+    wide = wide.reindex(columns=['Actual', latest_model_run]).reset_index().sort_values(['Crop', 'Period'])
+
+    actual = wide.dropna(subset=['Actual']).copy()
+    by_crop = actual.groupby('Crop')
+    prev_value = by_crop['Actual'].shift()
+    consecutive = by_crop['Period'].diff() == 1
+    actual['MoM'] = (actual['Actual'] / prev_value - 1).where(consecutive)
+    latest = by_crop.tail(1).set_index('Crop')
+    sparklines = by_crop.tail(SPARKLINE_MONTHS).groupby('Crop')['Actual'].agg(list)
+
+    # First forecast month after the latest actual price of each crop
+    ahead = wide.merge(latest[['Period', 'Actual']], left_on='Crop', right_index=True, suffixes=('', '_latest'))
+    ahead = ahead[(ahead['Period'] > ahead['Period_latest']) & ahead[latest_model_run].notna()]
+    forecast = ahead.groupby('Crop').head(1).set_index('Crop')
+    gap_pct = forecast[latest_model_run] / forecast['Actual_latest'] - 1
+
+    return {
+        crop: Tile(
+            period=_period_label(row.Period),
+            latest=float(row.Actual),
+            mom_change=None if pd.isna(row.MoM) else float(row.MoM),
+            forecast_period=_period_label(forecast.loc[crop, 'Period']) if crop in forecast.index else None,
+            forecast_gap=float(gap_pct[crop]) if crop in gap_pct.index else None,
+            sparkline=sparklines[crop],
+        )
+        for crop, row in latest.iterrows()
+    }
+
+
+def crop_tiles(latest_model_run, dataset=None):
+    """{crop key: Tile} for every crop that has at least one actual price."""
+    dataset = dataset or current_dataset()
+    return _tiles(dataset.version, latest_model_run, dataset)
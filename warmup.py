@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from crops import CROPS, LATEST_MODEL_RUN
+
+# Cache warm-up at server start.
+#
+# Loads every sheet, builds the indexes and validation report, and renders
+# the default figure, accuracy table and homepage tiles of every crop in a
+# background thread pool, so the first visitors after a deploy hit hot
+# caches. All of these are st.cache_resource entries shared by the whole
+# process, which is why the warm-up has to run inside the server process
+# (serve.py starts it before the server; homepage.py starts it on the first
+# rerun otherwise). STATUS tells the readiness endpoint when it is done.
+#
+# The warm-up runs once per process. Loading the data is retried with
+# backoff until it works (the workbook may still be being copied in during a
+# deploy). If a crop or the tiles fail, the status is 'failed' and only
+# those tasks are retried, with the same backoff, until they succeed here or
+# the watcher re-warms them after a reload; the status never goes back to
+# 'warming'.
+
+WARMUP_WORKERS = 4
+
+# Seconds between retries of a failed task, doubled up to the maximum
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WarmupStatus:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = 'pending'      # pending -> warming -> ready | failed
+        self.started = None
+        self.finished = None
+        self.timings = {}           # task name: seconds
+        self.errors = {}            # task name: error message
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    def _set(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def run(self, name, task, *args):
+        """Run one warm-up task, recording its time and error; returns whether it succeeded."""
+        start = time.perf_counter()
+        try:
+            task(*args)
+        except Exception as e:
+            _LOGGER.exception("warm-up task %s failed", name)
+            with self._lock:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+            return False
+        finally:
+            with self._lock:
+                self.timings[name] = round(time.perf_counter() - start, 3)
+        self.succeeded(name)
+        return True
+
+    def succeeded(self, name):
+        """A task ran fine (here or in the watcher): clear its error, and the failure once none is left."""
+        with self._lock:
+            self.errors.pop(name, None)
+            if self.state == 'failed' and not self.errors:
+                self.state = 'ready'
+                self.finished = time.time()
+
+    def failed_tasks(self):
+        with self._lock:
+            return list(self.errors)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'seconds': round((self.finished or time.time()) - self.started, 3) if self.started else None,
+                'tasks': dict(self.timings),
+                'errors': dict(self.errors),
+            }
+
+
+STATUS = WarmupStatus()
+_started = threading.Lock()
+
+
+def _load_data():
+    from data_store import latest_dataset
+
+    # Everything else reads from the dataset, so it is loaded first and alone
+    dataset = latest_dataset()
+    for sheet in dataset.versions:
+        dataset.index(sheet)
+
+
+def _warm_crop(crop, latest_model_run, dataset=None):
+    from crop_page import accuracy_table, crop_figure, default_selection
+    from data_store import latest_dataset
+
+    dataset = dataset or latest_dataset()
+    crop_figure(crop, default_selection(crop, latest_model_run), dataset=dataset)
+    accuracy_table(crop, dataset)
+
+
+def _warm_tiles(latest_model_run, dataset=None):
+    from data_store import latest_dataset
+    from tiles import crop_tiles
+
+    crop_tiles(latest_model_run, dataset or latest_dataset())
+
+
+def _tasks(latest_model_run):
+    """{task name: (function, *args)} of everything warmed after the data."""
+    return {
+        'tiles': (_warm_tiles, latest_model_run),
+        **{crop.key: (_warm_crop, crop, latest_model_run) for crop in CROPS.values()},
+    }
+
+
+def warm_up(latest_model_run=LATEST_MODEL_RUN, workers=WARMUP_WORKERS):
+    """Fill the data, figure and accuracy caches; returns the status."""
+    STATUS._set(state='warming', started=time.time(), finished=None)
+    delay = RETRY_DELAY
+    while not STATUS.run('data', _load_data):
+        _LOGGER.warning("warm-up could not load the data, retrying in %.0fs", delay)
+        time.sleep(delay)
+        delay = min(delay * 2, MAX_RETRY_DELAY)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='warmup') as pool:
+        for name, (task, *args) in _tasks(latest_model_run).items():
+            pool.submit(STATUS.run, name, task, *args)
+    STATUS._set(state='failed' if STATUS.errors else 'ready', finished=time.time())
+    _LOGGER.info("warm-up %s in %.1fs", STATUS.state, STATUS.finished - STATUS.started)
+    return STATUS
+
+
+def retry_failed(latest_model_run=LATEST_MODEL_RUN):
+    """Re-run only the failed tasks, with backoff, until none is left."""
+    tasks = _tasks(latest_model_run)
+    delay = RETRY_DELAY
+    while STATUS.state == 'failed':
+        _LOGGER.warning("warm-up tasks failed (%s), retrying in %.0fs", ', '.join(STATUS.failed_tasks()), delay)
+        time.sleep(delay)
+        delay = min(delay * 2, MAX_RETRY_DELAY)
+        for name in STATUS.failed_tasks():
+            if name in tasks:
+                task, *args = tasks[name]
+                STATUS.run(name, task, *args)
+
+
+def _run(latest_model_run, workers):
+    warm_up(latest_model_run, workers)
+    retry_failed(latest_model_run)
+
+
+def start(latest_model_run=LATEST_MODEL_RUN, workers=WARMUP_WORKERS):
+    """Start the warm-up in a background thread, once per process; returns the status."""
+    if _started.acquire(blocking=False):
+        threading.Thread(
+            target=_run, args=(latest_model_run, workers), name='warmup', daemon=True
+        ).start()
+    return STATUS
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    status = warm_up()
+    for name, seconds in sorted(status.timings.items(), key=lambda item: -item[1]):
+        print(f"{name:<12} {seconds:7.3f}s {status.errors.get(name, '')}")
+    print(status.state)
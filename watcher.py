@@ -0,0 +1,70 @@
+import logging
+import threading
+
+from crops import CROPS, LATEST_MODEL_RUN
+from snapshot import WORKBOOK
+
+# Reloads price_data.xlsx as soon as it changes on disk.
+#
+# Polls the file and, on a change, re-hashes its sheet parts: only the
+# sheets whose cells changed are re-parsed into new snapshot files and
+# loaded, then the default views of the affected crops are re-warmed. Every
+# other sheet keeps its version, so its frames, slices, figures and accuracy
+# partitions stay cached and sessions on those crops notice nothing. Without
+# the watcher the same happens lazily on the first rerun after the change.
+# Crops re-warmed after a reload also clear their failed warm-up tasks.
+
+WATCH_INTERVAL = 2.0
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def reload(path=WORKBOOK, latest_model_run=LATEST_MODEL_RUN, previous=None):
+    """Load the current workbook version; returns (versions, names of the changed sheets)."""
+    from data_store import latest_dataset
+    from warmup import STATUS, _warm_crop, _warm_tiles
+
+    # Builds the changed sheets and publishes the new Dataset; reruns that
+    # already pinned the previous one finish on it
+    dataset = latest_dataset(path)
+    versions = dict(dataset.versions)
+    changed = [sheet for sheet, version in versions.items() if (previous or {}).get(sheet) != version]
+    for sheet in changed:
+        dataset.index(sheet)
+    STATUS.succeeded('data')
+    if changed and previous is not None:
+        # Only what was re-warmed here clears its warm-up error
+        for crop in CROPS.values():
+            if crop.sheet in changed:
+                _warm_crop(crop, latest_model_run, dataset)
+                STATUS.succeeded(crop.key)
+        _warm_tiles(latest_model_run, dataset)
+        STATUS.succeeded('tiles')
+    return versions, changed
+
+
+def watch(path=WORKBOOK, interval=WATCH_INTERVAL, stop=None, latest_model_run=LATEST_MODEL_RUN):
+    from data_store import file_key
+
+    stop = stop or threading.Event()
+    key, versions = None, None
+    while not stop.is_set():
+        try:
+            current = file_key(path)
+            if current != key:
+                first = versions is None
+                versions, changed = reload(path, latest_model_run, versions)
+                key = current
+                if changed and not first:
+                    _LOGGER.info("reloaded %s: %s", path, ', '.join(changed))
+        except Exception:
+            # Most likely a save in progress; retried on the next tick
+            _LOGGER.warning("could not reload %s", path, exc_info=True)
+        stop.wait(interval)
+
+
+def start(path=WORKBOOK, interval=WATCH_INTERVAL):
+    """Watch the workbook from a daemon thread; set the returned event to stop."""
+    stop = threading.Event()
+    threading.Thread(target=watch, args=(path, interval, stop), name='workbook-watcher', daemon=True).start()
+    return stop